@@ -0,0 +1,134 @@
+"""Process-wide NLP resources shared by every analysis call.
+
+Loading the NLTK stop words, probing the punkt tokenizer and parsing the
+pattern sentiment lexicon used by TextBlob and ``LexiconSentimentEngine``
+take a noticeable time. ``AnalyzerResources`` loads each resource once per
+process behind a lock, so concurrent dashboard sessions (threads of one
+Streamlit server), background jobs and repeated CLI chunks all share the
+same objects, and records how long each load took.
+"""
+import os
+import threading
+import time
+
+from lexicon_engine import LexiconSentimentEngine
+
+FALLBACK_STOP_WORDS = frozenset(['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'])
+
+
+# NLTK data shipped next to the code, searched after the default locations
+NLTK_DATA_PATH = os.path.join(os.path.dirname(__file__), 'nltk_data')
+
+
+def _nltk():
+    # nltk is imported on first use: it is one of the slowest imports here
+    import nltk
+    if os.path.exists(NLTK_DATA_PATH) and NLTK_DATA_PATH not in nltk.data.path:
+        nltk.data.path.append(NLTK_DATA_PATH)
+    return nltk
+
+
+def _load_stop_words():
+    _nltk()
+    from nltk.corpus import stopwords
+    try:
+        return frozenset(stopwords.words('english'))
+    except LookupError:
+        # Fallback to basic stop words if NLTK data is not available
+        return FALLBACK_STOP_WORDS
+
+
+def _load_word_tokenizer():
+    _nltk()
+    from nltk.tokenize import word_tokenize
+    try:
+        word_tokenize('warm up')
+        return word_tokenize
+    except LookupError:
+        # Fallback to simple split if NLTK tokenizer is not available
+        return str.split
+
+
+def _load_sentiment_lexicon():
+    # pattern's lexicon is a lazily loaded module global that TextBlob's
+    # analyzer reads; loading it here keeps two threads from both parsing it
+    from textblob.en import sentiment
+    if dict.__len__(sentiment) == 0:
+        sentiment.load()
+    return sentiment
+
+
+class AnalyzerResources:
+    """Lazily loaded, thread-safe holder of the analyzer's NLP resources"""
+
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+        self.load_times = {}
+
+    def _get(self, name, load):
+        # Lock-free once loaded; the lock only serializes the first load
+        if name not in self._values:
+            with self._lock:
+                if name not in self._values:
+                    started = time.perf_counter()
+                    value = load()
+                    self.load_times[name] = time.perf_counter() - started
+                    self._values[name] = value
+        return self._values[name]
+
+    @property
+    def stop_words(self):
+        return self._get('stop_words', _load_stop_words)
+
+    @property
+    def word_tokenizer(self):
+        return self._get('word_tokenizer', _load_word_tokenizer)
+
+    @property
+    def sentiment_lexicon(self):
+        return self._get('sentiment_lexicon', _load_sentiment_lexicon)
+
+    # Dependencies are resolved before _get so each load time counts only
+    # its own work and no load runs while another one holds the lock
+
+    @property
+    def textblob_analyzer(self):
+        self.sentiment_lexicon
+        from textblob.en.sentiments import PatternAnalyzer
+        return self._get('textblob_analyzer', PatternAnalyzer)
+
+    @property
+    def lexicon_engine(self):
+        lexicon = self.sentiment_lexicon
+        return self._get('lexicon_engine', lambda: LexiconSentimentEngine(lexicon))
+
+    def warm_up(self, engine='lexicon'):
+        """Load everything the given engine needs; returns self"""
+        self.stop_words
+        self.word_tokenizer
+        self.sentiment_lexicon
+        if engine == 'lexicon':
+            self.lexicon_engine
+        else:
+            self.textblob_analyzer
+        return self
+
+    @property
+    def warm_up_seconds(self):
+        return sum(self.load_times.values())
+
+    def stats(self):
+        return {
+            'loaded': sorted(self._values),
+            'load_times': dict(self.load_times),
+            'warm_up_seconds': self.warm_up_seconds,
+        }
+
+
+_resources = AnalyzerResources()
+
+
+def get_analyzer_resources():
+    """Return the resources shared by everything in this process"""
+    return _resources
@@ -1,20 +1,15 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-import io
-import json
-import csv
 from datetime import datetime
 import os
+import shutil
 import sys
+import uuid
 
 # Add the current directory to the path to import our modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from sentiment_analyzer import analyze_sentiment_textblob, extract_keywords, batch_analyze_sentiment, get_sentiment_explanation
+from sentiment_analyzer import analyze_sentiment_textblob, extract_keywords, batch_analyze_sentiment, get_sentiment_explanations
 from visualizations import (
     create_sentiment_distribution_chart,
     create_sentiment_over_time_chart,
@@ -24,9 +19,29 @@ from visualizations import (
     create_wordcloud,
     create_keyword_frequency_chart,
     create_sentiment_metrics_summary,
-    display_comparative_analysis
+    display_comparative_analysis,
+    FigureCache
 )
-from export_utils import export_to_csv, export_to_json, export_to_excel, create_pdf_report, batch_process_files
+from compact_results import expand_results
+from export_utils import (
+    export_csv_file,
+    export_ndjson_file,
+    export_excel_file,
+    export_parquet_file,
+    export_arrow_file,
+    export_to_json,
+    create_pdf_report,
+    INPUT_EXTENSIONS
+)
+from result_cache import get_result_cache
+from results_store import ResultsStore
+from jobs import get_job_manager
+from analyzer_resources import get_analyzer_resources
+from near_duplicates import NearDuplicateIndex
+
+# Explanations and the results table are rendered one page at a time
+EXPLANATION_PAGE_SIZES = [10, 25, 50, 100]
+RESULTS_PAGE_SIZES = [25, 50, 100, 500]
 
 # Set page configuration
 st.set_page_config(
@@ -62,8 +77,22 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Initialize session state
-if 'analysis_results' not in st.session_state:
-    st.session_state.analysis_results = pd.DataFrame()
+if 'results_store' not in st.session_state:
+    st.session_state.results_store = ResultsStore()
+if 'figure_cache' not in st.session_state:
+    st.session_state.figure_cache = FigureCache()
+if 'analysis_jobs' not in st.session_state:
+    st.session_state.analysis_jobs = []
+if 'session_id' not in st.session_state:
+    # Subscriber id for background jobs shared with other sessions
+    st.session_state.session_id = uuid.uuid4().hex
+
+@st.cache_resource(show_spinner="Loading NLP resources...")
+def load_analyzer_resources():
+    # One warm-up per server process, shared by every session
+    return get_analyzer_resources().warm_up()
+
+analyzer_resources = load_analyzer_resources()
 
 def main():
     # Header
@@ -82,25 +111,37 @@ def main():
         st.markdown("---")
         
         # Filters (will be populated based on data)
-        if not st.session_state.analysis_results.empty:
+        results_store = st.session_state.results_store
+        sentiment_filter = None
+        source_filter = None
+        if not results_store.empty:
             st.markdown('<div class="sidebar-header">🔍 Filters</div>', unsafe_allow_html=True)
+            filter_index = results_store.filter_index()
             
             # Sentiment filter
             sentiment_filter = st.multiselect(
                 "Filter by Sentiment",
-                options=st.session_state.analysis_results['sentiment'].unique(),
-                default=st.session_state.analysis_results['sentiment'].unique()
+                options=filter_index.values('sentiment'),
+                default=filter_index.values('sentiment')
             )
             
             # Source filter
-            if 'source' in st.session_state.analysis_results.columns:
+            if 'source' in results_store.columns:
                 source_filter = st.multiselect(
                     "Filter by Source",
-                    options=st.session_state.analysis_results['source'].unique(),
-                    default=st.session_state.analysis_results['source'].unique()
+                    options=filter_index.values('source'),
+                    default=filter_index.values('source')
                 )
-            else:
-                source_filter = None
+        
+        # Result cache statistics (shared by all sessions in this process)
+        with st.expander("⚡ Cache Statistics"):
+            cache_stats = get_result_cache().stats()
+            st.write(f"**Hits:** {cache_stats['hits']} ({cache_stats['hit_rate']:.1%})")
+            st.write(f"**Misses:** {cache_stats['misses']}")
+            st.write(f"**Cached entries:** {cache_stats['entries']}")
+            if cache_stats['path']:
+                st.write(f"**Disk cache:** {cache_stats['path']} ({cache_stats['disk_hits']} hits)")
+            st.write(f"**NLP warm-up:** {analyzer_resources.warm_up_seconds:.2f}s (once per server process)")
     
     # Main content area
     if analysis_mode == "Single Text Analysis":
@@ -110,9 +151,13 @@ def main():
     elif analysis_mode == "File Upload Analysis":
         file_upload_analysis()
     
+    # Background file analysis jobs of this session
+    if st.session_state.analysis_jobs:
+        display_analysis_jobs()
+    
     # Display results if available
-    if not st.session_state.analysis_results.empty:
-        display_analysis_results()
+    if not st.session_state.results_store.empty:
+        display_analysis_results(sentiment_filter, source_filter)
 
 def single_text_analysis():
     st.subheader("🔍 Single Text Analysis")
@@ -143,7 +188,6 @@ def single_text_analysis():
                 # Perform analysis
                 sentiment, confidence, polarity, subjectivity = analyze_sentiment_textblob(text_input)
                 keywords = extract_keywords(text_input, num_keywords)
-                explanation = get_sentiment_explanation(text_input, sentiment, polarity)
                 
                 # Create result dataframe
                 result = pd.DataFrame([{
@@ -154,12 +198,11 @@ def single_text_analysis():
                     'subjectivity': subjectivity,
                     'keywords': keywords,
                     'source': source if source else 'Manual Input',
-                    'date': str(date),
-                    'explanation': explanation
+                    'date': str(date)
                 }])
                 
                 # Update session state
-                st.session_state.analysis_results = pd.concat([st.session_state.analysis_results, result], ignore_index=True)
+                st.session_state.results_store.append(result)
                 
                 st.success("✅ Analysis completed!")
                 st.rerun()
@@ -182,6 +225,17 @@ def batch_text_analysis():
     with col2:
         default_date = st.date_input("Default date for all texts", value=datetime.now())
     
+    group_near_duplicates = st.checkbox(
+        "Group near-duplicates",
+        help="Cluster texts that differ only slightly (retweets, handles, links) and analyze one text per cluster"
+    )
+    if group_near_duplicates:
+        threshold = st.slider("Similarity threshold", 0.5, 1.0, 0.8, 0.05)
+        # One index per session so clusters continue across batches
+        index = st.session_state.get('near_duplicate_index')
+        if index is None or index.threshold != threshold:
+            st.session_state.near_duplicate_index = NearDuplicateIndex(threshold)
+    
     if st.button("🚀 Analyze Batch", type="primary"):
         if batch_text.strip():
             # Split texts by lines
@@ -198,18 +252,18 @@ def batch_text_analysis():
             
             # Perform batch analysis
             with st.spinner("Analyzing texts..."):
-                results = batch_analyze_sentiment(text_data)
-                
-                # Add explanations
-                results['explanation'] = results.apply(
-                    lambda row: get_sentiment_explanation(row['text'], row['sentiment'], row['polarity']),
-                    axis=1
-                )
+                index = st.session_state.near_duplicate_index if group_near_duplicates else None
+                results = batch_analyze_sentiment(text_data, near_duplicates=index)
                 
                 # Update session state
-                st.session_state.analysis_results = pd.concat([st.session_state.analysis_results, results], ignore_index=True)
+                st.session_state.results_store.append(results)
             
-            st.success(f"✅ Analyzed {len(texts)} texts successfully!")
+            dedup = results.attrs['dedup']
+            # A toast survives the rerun below
+            st.toast(f"✅ Analyzed {len(texts)} texts successfully! "
+                     f"({dedup['unique_texts']} unique, {dedup['dedup_ratio']:.0%} duplicates skipped"
+                     + (f", {results.attrs['near_duplicates']['clusters']} near-duplicate clusters)"
+                        if 'near_duplicates' in results.attrs else ")"))
             st.rerun()
         else:
             st.error("Please enter some texts to analyze.")
@@ -219,9 +273,11 @@ def file_upload_analysis():
     
     uploaded_files = st.file_uploader(
         "Choose files",
-        type=['csv', 'txt'],
+        type=[extension.lstrip('.') for extension in INPUT_EXTENSIONS],
         accept_multiple_files=True,
-        help="CSV files should have a 'text' column. TXT files will be processed line by line. Optional columns for CSV: 'source', 'date'"
+        help="CSV, JSONL, Parquet and Arrow/Feather files should have a 'text' column, optionally 'source' and 'date'. "
+             "TXT files will be processed line by line. CSV, TXT and JSONL may be gzip (.gz) or zstd (.zst) compressed, "
+             "and .zip archives are read member by member"
     )
     
     if uploaded_files:
@@ -234,39 +290,12 @@ def file_upload_analysis():
         # Process files button
         if st.button("🚀 Analyze All Files", type="primary"):
             try:
-                # Use batch processing utility
-                combined_df = batch_process_files(uploaded_files)
-                
-                if combined_df.empty:
-                    st.error("No valid data found in uploaded files.")
-                    return
-                
-                st.write("### Combined File Preview")
-                st.dataframe(combined_df.head())
-                
-                # Prepare data for analysis
-                text_data = []
-                for _, row in combined_df.iterrows():
-                    text_data.append({
-                        'text': str(row['text']),
-                        'source': str(row.get('source', row.get('file_source', 'File Upload'))),
-                        'date': str(row.get('date', datetime.now().date()))
-                    })
-                
-                # Perform batch analysis
-                with st.spinner(f"Analyzing {len(text_data)} texts from {len(uploaded_files)} file(s)..."):
-                    results = batch_analyze_sentiment(text_data)
-                    
-                    # Add explanations
-                    results['explanation'] = results.apply(
-                        lambda row: get_sentiment_explanation(row['text'], row['sentiment'], row['polarity']),
-                        axis=1
-                    )
-                    
-                    # Update session state
-                    st.session_state.analysis_results = pd.concat([st.session_state.analysis_results, results], ignore_index=True)
-                
-                st.success(f"✅ Analyzed {len(text_data)} texts from {len(uploaded_files)} file(s) successfully!")
+                # Files are analyzed in the background, chunk by chunk
+                job = get_job_manager().submit(
+                    [(uploaded_file.name, uploaded_file) for uploaded_file in uploaded_files],
+                    subscriber=st.session_state.session_id
+                )
+                track_analysis_job(job)
                 st.rerun()
                 
             except Exception as e:
@@ -285,11 +314,11 @@ def file_upload_analysis():
     
     if uploaded_file is not None:
         try:
-            # Read the CSV file
-            df = pd.read_csv(uploaded_file)
+            # Only the first rows are parsed for the preview and column mapping
+            df = pd.read_csv(uploaded_file, nrows=5)
             
             st.write("### File Preview")
-            st.dataframe(df.head())
+            st.dataframe(df)
             
             # Check if 'text' column exists
             if 'text' not in df.columns:
@@ -302,47 +331,164 @@ def file_upload_analysis():
             date_col = st.selectbox("Date column (optional)", ['None'] + list(df.columns), key="date_col_select")
             
             if st.button("🚀 Analyze Single File", type="primary", key="analyze_single_file"):
-                # Prepare data for analysis
-                text_data = []
-                for _, row in df.iterrows():
-                    text_data.append({
-                        'text': str(row[text_col]),
-                        'source': str(row[source_col]) if source_col != 'None' else 'File Upload',
-                        'date': str(row[date_col]) if date_col != 'None' else str(datetime.now().date())
-                    })
-                
-                # Perform batch analysis
-                with st.spinner(f"Analyzing {len(text_data)} texts from file..."):
-                    results = batch_analyze_sentiment(text_data)
-                    
-                    # Add explanations
-                    results['explanation'] = results.apply(
-                        lambda row: get_sentiment_explanation(row['text'], row['sentiment'], row['polarity']),
-                        axis=1
-                    )
-                    
-                    # Update session state
-                    st.session_state.analysis_results = pd.concat([st.session_state.analysis_results, results], ignore_index=True)
-                
-                st.success(f"✅ Analyzed {len(text_data)} texts from file successfully!")
+                job = get_job_manager().submit([(uploaded_file.name, uploaded_file)], {
+                    'text_column': text_col,
+                    'source_column': source_col if source_col != 'None' else None,
+                    'date_column': date_col if date_col != 'None' else None,
+                    'default_source': 'File Upload'
+                }, subscriber=st.session_state.session_id)
+                track_analysis_job(job)
                 st.rerun()
                 
         except Exception as e:
             st.error(f"Error reading file: {str(e)}")
 
-def display_analysis_results():
+def track_analysis_job(job):
+    if job.id not in st.session_state.analysis_jobs:
+        st.session_state.analysis_jobs.append(job.id)
+
+def _forget_analysis_job(job_id):
+    st.session_state.analysis_jobs.remove(job_id)
+    get_job_manager().discard(job_id, st.session_state.session_id)
+
+@st.fragment(run_every=1.0)
+def display_analysis_jobs():
+    """Progress of this session's background jobs, polled without rerunning the whole page"""
+    st.subheader("⏳ File Analysis Jobs")
+    manager = get_job_manager()
+    finished = False
+    
+    for job_id in list(st.session_state.analysis_jobs):
+        job = manager.get(job_id)
+        if job is None:
+            st.session_state.analysis_jobs.remove(job_id)
+            continue
+        
+        # Read the status first: a job seen as finished has no chunks left to take
+        status = job.status
+        # Finished chunks join the results as soon as they are checkpointed
+        for results in job.take_results(st.session_state.session_id):
+            st.session_state.results_store.append(results)
+        
+        label = ", ".join(name for name, _ in job.inputs)
+        resumed = f", {job.resumed_chunks} resumed from checkpoint" if job.resumed_chunks else ""
+        if job.analyzed_rows:
+            resumed += f", {job.dedup_ratio:.0%} duplicates skipped"
+        st.progress(
+            job.progress,
+            text=f"{label}: {status} - {job.rows:,} rows in {job.chunks_done} chunks "
+                 f"({job.rows_per_second:,.0f} rows/s{resumed})"
+        )
+        
+        if status in ('queued', 'running'):
+            st.button("⏹ Cancel", key=f"cancel_job_{job_id}", on_click=job.cancel)
+        elif status == 'completed':
+            if job.rows:
+                st.toast(f"✅ Analyzed {job.rows:,} texts from {label} successfully!")
+            else:
+                st.toast(f"No valid data found in {label}.")
+            _forget_analysis_job(job_id)
+            finished = True
+        else:
+            if status == 'failed':
+                st.error(f"Error processing files: {job.error}")
+            else:
+                st.warning("Cancelled. Finished chunks are kept and resuming continues from the next one.")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.button("▶️ Resume", key=f"resume_job_{job_id}", on_click=job.start)
+            with col2:
+                st.button("🗑 Dismiss", key=f"dismiss_job_{job_id}", on_click=_forget_analysis_job, args=(job_id,))
+    
+    if finished:
+        # Refresh the charts and filters with the complete results
+        st.rerun()
+
+def _jump_to_text(filtered_data):
+    # Open the page holding the requested text, or the next one the filters keep
+    position = filtered_data.index.searchsorted(st.session_state.explanation_jump - 1)
+    position = min(position, len(filtered_data) - 1)
+    st.session_state.explanation_page = position // st.session_state.explanation_page_size + 1
+
+def display_explanations(filtered_data):
+    """Paginated explanations: only the rows of the current page are sliced and explained"""
+    total = len(filtered_data)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        page_size = st.selectbox(
+            "Rows per page", EXPLANATION_PAGE_SIZES, key="explanation_page_size",
+            on_change=lambda: st.session_state.update(explanation_page=1)
+        )
+    pages = -(-total // page_size)
+    last_text = int(filtered_data.index[-1]) + 1
+    # Filters or a larger page size can leave previous inputs out of range
+    if st.session_state.get("explanation_page", 1) > pages:
+        st.session_state.explanation_page = pages
+    if st.session_state.get("explanation_jump", 1) > last_text:
+        st.session_state.explanation_jump = last_text
+    with col2:
+        page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, step=1, key="explanation_page")
+    with col3:
+        st.number_input(
+            "Jump to text #", min_value=1, max_value=last_text, step=1,
+            key="explanation_jump", on_change=_jump_to_text, args=(filtered_data,)
+        )
+    
+    start = (page - 1) * page_size
+    rows = filtered_data.iloc[start:start + page_size]
+    explanations = get_sentiment_explanations(rows['text'], rows['sentiment'], rows['polarity'])
+    st.caption(f"Showing {start + 1:,}-{start + len(rows):,} of {total:,}")
+    st.markdown("\n\n".join(
+        f"**Text {idx + 1}:** {explanation}" for idx, explanation in zip(rows.index, explanations)
+    ))
+
+# Export formats written to a file on disk: (writer, uncompressed MIME type)
+STREAMED_EXPORTS = {
+    "CSV": (export_csv_file, "text/csv"),
+    "NDJSON": (export_ndjson_file, "application/x-ndjson"),
+    "Excel": (export_excel_file, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    # Columnar formats compress internally with zstd
+    "Parquet": (export_parquet_file, "application/vnd.apache.parquet"),
+    "Arrow": (export_arrow_file, "application/vnd.apache.arrow.file"),
+}
+
+COMPRESSIBLE_EXPORTS = ("CSV", "NDJSON")
+
+def _replace_export_file(path):
+    """Remember this session's latest export file, deleting the previous one"""
+    previous = st.session_state.get('export_file')
+    if previous and previous != path:
+        shutil.rmtree(os.path.dirname(previous), ignore_errors=True)
+    st.session_state.export_file = path
+
+def display_analysis_results(sentiment_filter=None, source_filter=None):
     st.markdown("---")
     st.subheader("📊 Analysis Results")
     
-    if st.session_state.analysis_results.empty:
+    if st.session_state.results_store.empty:
         st.info("No analysis results yet. Please analyze some text first.")
         return
     
-    # Apply filters if they exist
-    filtered_data = st.session_state.analysis_results.copy()
+    # Apply filters if they exist (the unfiltered frame is used as-is)
+    filtered_data, filter_key = st.session_state.results_store.filtered({
+        'sentiment': sentiment_filter,
+        'source': source_filter
+    })
+    
+    if filtered_data.empty:
+        st.info("No results match the current filters.")
+        return
+    
+    # Charts are rebuilt only when the data, filters or their parameters
+    # change, not on every rerun triggered by an unrelated widget
+    data_key = (st.session_state.results_store.version, filter_key)
+    
+    def cached_chart(chart_function, *args):
+        key = (chart_function.__name__, data_key) + args
+        return st.session_state.figure_cache.get_or_create(key, lambda: chart_function(filtered_data, *args))
     
     # Get summary metrics
-    metrics = create_sentiment_metrics_summary(filtered_data)
+    metrics = cached_chart(create_sentiment_metrics_summary)
     
     # Display summary metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -374,7 +520,8 @@ def display_analysis_results():
     with col8:
         # Clear results button
         if st.button("🗑️ Clear All Results"):
-            st.session_state.analysis_results = pd.DataFrame()
+            st.session_state.results_store.clear()
+            st.session_state.figure_cache.clear()
             st.rerun()
     
     # Visualization tabs
@@ -386,31 +533,31 @@ def display_analysis_results():
         
         with col1:
             # Sentiment distribution pie chart
-            fig_pie = create_sentiment_distribution_chart(filtered_data)
+            fig_pie = cached_chart(create_sentiment_distribution_chart)
             if fig_pie:
                 st.plotly_chart(fig_pie, use_container_width=True)
         
         with col2:
             # Confidence distribution histogram
-            fig_conf = create_confidence_distribution_chart(filtered_data)
+            fig_conf = cached_chart(create_confidence_distribution_chart)
             if fig_conf:
                 st.plotly_chart(fig_conf, use_container_width=True)
         
         # Sentiment by source (if multiple sources exist)
         if 'source' in filtered_data.columns and len(filtered_data['source'].unique()) > 1:
-            fig_source = create_sentiment_by_source_chart(filtered_data)
+            fig_source = cached_chart(create_sentiment_by_source_chart)
             if fig_source:
                 st.plotly_chart(fig_source, use_container_width=True)
         
         # Polarity vs Subjectivity scatter plot
-        fig_scatter = create_polarity_vs_subjectivity_scatter(filtered_data)
+        fig_scatter = cached_chart(create_polarity_vs_subjectivity_scatter)
         if fig_scatter:
             st.plotly_chart(fig_scatter, use_container_width=True)
     
     with tab2:
         # Trends over time
         if 'date' in filtered_data.columns:
-            fig_time = create_sentiment_over_time_chart(filtered_data)
+            fig_time = cached_chart(create_sentiment_over_time_chart)
             if fig_time:
                 st.plotly_chart(fig_time, use_container_width=True)
             else:
@@ -424,14 +571,14 @@ def display_analysis_results():
         
         with col1:
             # Word cloud
-            sentiment_filter = st.multiselect(
+            wordcloud_sentiments = st.multiselect(
                 "Filter word cloud by sentiment:",
                 options=filtered_data['sentiment'].unique(),
                 default=filtered_data['sentiment'].unique(),
                 key="wordcloud_filter"
             )
             
-            fig_wordcloud = create_wordcloud(filtered_data, sentiment_filter)
+            fig_wordcloud = cached_chart(create_wordcloud, tuple(wordcloud_sentiments))
             if fig_wordcloud:
                 st.pyplot(fig_wordcloud)
             else:
@@ -440,7 +587,7 @@ def display_analysis_results():
         with col2:
             # Top keywords bar chart
             top_n = st.slider("Number of top keywords to show:", 5, 20, 10, key="top_keywords_slider")
-            fig_keywords = create_keyword_frequency_chart(filtered_data, top_n)
+            fig_keywords = cached_chart(create_keyword_frequency_chart, top_n)
             if fig_keywords:
                 st.plotly_chart(fig_keywords, use_container_width=True)
             else:
@@ -451,59 +598,84 @@ def display_analysis_results():
         st.subheader("📋 Detailed Results")
         
         # Show dataframe with key columns
-        display_columns = ['text', 'sentiment', 'confidence', 'polarity', 'source', 'date']
+        display_columns = ['text', 'sentiment', 'confidence', 'polarity', 'source', 'date', 'cluster_id']
         available_columns = [col for col in display_columns if col in filtered_data.columns]
         
+        # Only the current page is serialized to the browser; sorting uses
+        # the store's argsort indexes, which are reused until the data changes
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            sort_by = st.selectbox("Sort by", ['None'] + available_columns, key="results_sort_by")
+        with col2:
+            ascending = st.radio("Order", ["Ascending", "Descending"], horizontal=True, key="results_sort_order") == "Ascending"
+        with col3:
+            page_size = st.selectbox("Rows per page", RESULTS_PAGE_SIZES, key="results_page_size")
+        pages = -(-len(filtered_data) // page_size)
+        if st.session_state.get("results_page", 1) > pages:
+            st.session_state.results_page = pages
+        with col4:
+            page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, step=1, key="results_page")
+        
+        start = (page - 1) * page_size
+        page_data = st.session_state.results_store.page(
+            {'sentiment': sentiment_filter, 'source': source_filter},
+            start, start + page_size,
+            sort_by=None if sort_by == 'None' else sort_by,
+            ascending=ascending
+        )
         st.dataframe(
-            filtered_data[available_columns],
+            expand_results(page_data)[available_columns],
             use_container_width=True,
             hide_index=True
         )
+        st.caption(f"Showing {start + 1:,}-{start + len(page_data):,} of {len(filtered_data):,}")
         
         # Show explanations
         with st.expander("🔍 View Explanations"):
-            for idx, row in filtered_data.iterrows():
-                if 'explanation' in row:
-                    st.write(f"**Text {idx + 1}:** {row['explanation']}")
+            display_explanations(filtered_data)
         
         # Export options
         st.subheader("📥 Export Data")
-        export_format = st.selectbox("Choose export format:", ["CSV", "JSON", "Excel", "PDF Report"])
+        export_format = st.selectbox("Choose export format:", ["CSV", "JSON", "NDJSON", "Excel", "Parquet", "Arrow", "PDF Report"])
+        compression = None
+        if export_format in COMPRESSIBLE_EXPORTS:
+            choice = st.radio("Compression", ["None", "gzip", "zstd"], horizontal=True)
+            compression = None if choice == "None" else choice
         
         if st.button("📥 Download Data"):
-            if export_format == "CSV":
-                csv_data, filename = export_to_csv(filtered_data)
-                st.download_button(
-                    label="Download CSV",
-                    data=csv_data,
-                    file_name=filename,
-                    mime="text/csv"
-                )
-            elif export_format == "JSON":
-                json_data, filename = export_to_json(filtered_data)
-                st.download_button(
-                    label="Download JSON",
-                    data=json_data,
-                    file_name=filename,
-                    mime="application/json"
-                )
-            elif export_format == "Excel":
-                excel_data, filename = export_to_excel(filtered_data)
-                st.download_button(
-                    label="Download Excel",
-                    data=excel_data,
-                    file_name=filename,
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                )
-            elif export_format == "PDF Report":
-                with st.spinner("Generating PDF report..."):
-                    pdf_data, filename = create_pdf_report(filtered_data)
+            if export_format in STREAMED_EXPORTS:
+                # Streamed to disk block by block straight from the compact
+                # results; the download reads the finished file back
+                export_file, mime = STREAMED_EXPORTS[export_format]
+                with st.spinner(f"Writing {export_format}..."):
+                    path, filename = export_file(filtered_data, compression=compression, explanations=True)
+                _replace_export_file(path)
+                with open(path, 'rb') as handle:
+                    st.download_button(
+                        label=f"Download {export_format}",
+                        data=handle,
+                        file_name=filename,
+                        mime={'gzip': "application/gzip", 'zstd': "application/zstd"}.get(compression, mime)
+                    )
+            else:
+                export_data = expand_results(filtered_data, explanations=True)
+                if export_format == "JSON":
+                    json_data, filename = export_to_json(export_data)
                     st.download_button(
-                        label="Download PDF Report",
-                        data=pdf_data,
+                        label="Download JSON",
+                        data=json_data,
                         file_name=filename,
-                        mime="application/pdf"
+                        mime="application/json"
                     )
+                elif export_format == "PDF Report":
+                    with st.spinner("Generating PDF report..."):
+                        pdf_data, filename = create_pdf_report(export_data)
+                        st.download_button(
+                            label="Download PDF Report",
+                            data=pdf_data,
+                            file_name=filename,
+                            mime="application/pdf"
+                        )
 
 if __name__ == "__main__":
     main()
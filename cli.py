@@ -0,0 +1,195 @@
+"""Headless batch runner for the sentiment pipeline.
+
+Reads CSV/TXT/JSONL, Parquet and Arrow inputs (optionally gzip/zstd/zip
+compressed), analyzes them in chunks (optionally across a process pool) and
+writes the results through export_utils, without importing Streamlit or any
+of the dashboard's plotting libraries.
+
+Example:
+    python cli.py reviews.csv tweets.jsonl -o results.parquet --workers 8
+"""
+import argparse
+import os
+import sys
+import time
+from itertools import chain
+
+import pandas as pd
+
+from sentiment_analyzer import SENTIMENT_ENGINES, DEFAULT_CHUNK_SIZE, iter_analyze, get_sentiment_explanations, dedup_stats
+from analyzer_resources import get_analyzer_resources
+from near_duplicates import NearDuplicateIndex
+from export_utils import (
+    EXPORT_COMPRESSIONS,
+    write_csv,
+    write_ndjson,
+    write_excel,
+    write_parquet,
+    write_arrow,
+    export_to_json,
+    create_pdf_report,
+    read_text_records
+)
+
+# Formats written chunk by chunk while the analysis runs
+STREAMING_WRITERS = {
+    'csv': write_csv,
+    'ndjson': write_ndjson,
+    'excel': write_excel,
+    'parquet': write_parquet,
+    'arrow': write_arrow,
+}
+
+# Streaming formats that can be compressed on the fly
+COMPRESSIBLE_FORMATS = ('csv', 'ndjson')
+
+# Formats compressed internally (zstd by default); --compression picks the codec
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+
+# Formats exported from the complete results
+EXPORTERS = {
+    'json': export_to_json,
+    'pdf': create_pdf_report,
+}
+
+EXTENSION_FORMATS = {
+    '.csv': 'csv',
+    '.json': 'json',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.xlsx': 'excel',
+    '.pdf': 'pdf',
+}
+
+COMPRESSION_EXTENSIONS = {extension: compression for compression, extension in EXPORT_COMPRESSIONS.items() if extension}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run sentiment analysis on files without the dashboard.")
+    parser.add_argument('inputs', nargs='+', help="CSV, TXT, JSONL, Parquet or Arrow/Feather files to analyze "
+                             "(.gz/.zst/.zip compressed row formats too)")
+    parser.add_argument('-o', '--output', required=True, help="Output file path")
+    parser.add_argument('-f', '--format', choices=sorted(set(EXPORTERS) | set(STREAMING_WRITERS)),
+                        help="Output format (default: inferred from the output extension)")
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help="Worker processes for analysis; 0 uses every CPU (default: 1)")
+    parser.add_argument('-c', '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Texts read and analyzed per chunk (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--compression', choices=[name for name in EXPORT_COMPRESSIONS if name],
+                        help="Compress CSV/NDJSON output (default: from a .gz/.zst output extension) "
+                             "or pick the Parquet/Arrow codec (default: zstd)")
+    parser.add_argument('--engine', choices=SENTIMENT_ENGINES, default='lexicon',
+                        help="Sentiment scoring engine (default: lexicon)")
+    parser.add_argument('--explanations', action='store_true',
+                        help="Add the per-row explanation column")
+    parser.add_argument('--no-dedup', dest='dedup', action='store_false',
+                        help="Analyze repeated texts again instead of copying the first result")
+    parser.add_argument('--near-duplicates', type=float, metavar='THRESHOLD',
+                        help="Cluster texts whose word-pair Jaccard similarity reaches THRESHOLD (e.g. 0.8) "
+                             "and add a cluster_id column")
+    parser.add_argument('--analyze-all-near-duplicates', dest='representatives_only', action='store_false',
+                        help="With --near-duplicates, analyze every text instead of one per cluster")
+    return parser
+
+
+def resolve_compression(output, output_format, compression=None):
+    suffix_compression = COMPRESSION_EXTENSIONS.get(os.path.splitext(output)[1].lower())
+    if output_format in COLUMNAR_FORMATS:
+        if suffix_compression:
+            raise ValueError(f"{output_format} files are compressed internally; use --compression instead of a suffix")
+        return compression
+    compression = compression or suffix_compression
+    if compression and output_format not in COMPRESSIBLE_FORMATS:
+        raise ValueError(f"Compression is only supported for {', '.join(COMPRESSIBLE_FORMATS + COLUMNAR_FORMATS)} output")
+    return compression
+
+
+def resolve_format(output, output_format=None):
+    if output_format:
+        return output_format
+    base, extension = os.path.splitext(output)
+    if extension.lower() in COMPRESSION_EXTENSIONS:
+        extension = os.path.splitext(base)[1]
+    extension = extension.lower()
+    if extension not in EXTENSION_FORMATS:
+        raise ValueError(f"Cannot infer output format from '{output}', pass --format")
+    return EXTENSION_FORMATS[extension]
+
+
+def run(inputs, output, output_format=None, workers=1, chunk_size=DEFAULT_CHUNK_SIZE,
+        engine='lexicon', explanations=False, dedup=True, near_duplicates=None,
+        representatives_only=True, compression=None, log=sys.stderr):
+    """Analyze the input files and write one output file; returns the number of rows.
+
+    near_duplicates is a similarity threshold enabling near-duplicate
+    clustering across all inputs. Streaming formats (CSV, NDJSON, Excel,
+    Parquet, Arrow) are written as the chunks are analyzed; CSV and NDJSON
+    can be compressed with gzip or zstd.
+    """
+    output_format = resolve_format(output, output_format)
+    compression = resolve_compression(output, output_format, compression)
+    records = chain.from_iterable(read_text_records(path, chunk_size) for path in inputs)
+    index = None
+    if near_duplicates is not None:
+        index = NearDuplicateIndex(near_duplicates, representatives_only=representatives_only)
+
+    resources = get_analyzer_resources().warm_up(engine)
+    print(f"Loaded NLP resources in {resources.warm_up_seconds:.2f}s", file=log)
+
+    def analyzed():
+        started = time.perf_counter()
+        rows = 0
+        unique_texts = 0
+        for results in iter_analyze(records, chunk_size=chunk_size, engine=engine, workers=workers or None,
+                                    dedup=dedup, near_duplicates=index):
+            yield results
+            rows += len(results)
+            unique_texts += results.attrs['dedup']['unique_texts']
+            elapsed = time.perf_counter() - started
+            print(f"Analyzed {rows} texts ({rows / elapsed:,.0f} texts/s, "
+                  f"{unique_texts} unique, dedup ratio {dedup_stats(rows, unique_texts)['dedup_ratio']:.1%})", file=log)
+
+    if output_format in STREAMING_WRITERS:
+        rows = STREAMING_WRITERS[output_format](analyzed(), output, compression, explanations=explanations)
+        if not rows and os.path.exists(output):
+            os.remove(output)
+    else:
+        frames = list(analyzed())
+        rows = sum(len(frame) for frame in frames)
+    if not rows:
+        raise ValueError("No texts found in the input files")
+    if index is not None:
+        stats = index.stats()
+        print(f"Found {stats['clusters']} near-duplicate clusters "
+              f"(near-duplicate ratio {stats['near_duplicate_ratio']:.1%})", file=log)
+    if output_format not in STREAMING_WRITERS:
+        results = pd.concat(frames)
+        if explanations:
+            results['explanation'] = get_sentiment_explanations(
+                results['text'], results['sentiment'], results['polarity']
+            )
+        data, _ = EXPORTERS[output_format](results)
+        mode = 'w' if isinstance(data, str) else 'wb'
+        with open(output, mode, **({'encoding': 'utf-8'} if mode == 'w' else {})) as handle:
+            handle.write(data)
+    print(f"Wrote {rows} results to {output} ({output_format}{', ' + compression if compression else ''})", file=log)
+    return rows
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        run(args.inputs, args.output, args.format, args.workers, args.chunk_size,
+            args.engine, args.explanations, args.dedup, args.near_duplicates, args.representatives_only,
+            args.compression)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""Memory-compact representation of analysis results.
+
+Results frames as produced by the analyzers keep one Python string per row
+for the date and source, a Python list of keyword strings per row and often
+an explanation that repeats the whole text. For long-running dashboard
+sessions the results store keeps a compact schema instead:
+
+- ``text`` as an Arrow string column (no per-row Python object)
+- ``sentiment`` as a categorical; ``source`` as a categorical unless most
+  values are distinct (e.g. "Batch Input 17"), then as an Arrow string column
+- ``date`` as datetime64 when every value round-trips through ``DATE_FORMAT``,
+  otherwise as a categorical of the original strings
+- float32 ``confidence``, ``polarity`` and ``subjectivity``
+- ``keywords`` as an Arrow ``list<int32>`` column (an offsets array plus a
+  values array) of ids into a process-wide ``KeywordVocabulary``
+- ``cluster_id`` (near-duplicate clusters, when present) as nullable Int64,
+  missing for rows analyzed without a near-duplicate index
+- no ``explanation``: it is derived from text, sentiment and polarity
+
+``expand_results`` converts back to the public column layout for exports.
+"""
+import ast
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+DATE_FORMAT = '%Y-%m-%d'
+
+# Columns dropped by compaction because they can be recomputed on demand
+DERIVED_COLUMNS = ('explanation',)
+
+FLOAT_COLUMNS = ('confidence', 'polarity', 'subjectivity')
+LABEL_COLUMNS = ('sentiment', 'source')
+
+KEYWORD_IDS_TYPE = pa.list_(pa.int32())
+STRING_DTYPE = pd.ArrowDtype(pa.string())
+
+# Categories only pay off while values repeat; above this share of distinct
+# values a categorical costs more than the strings themselves
+MAX_CATEGORY_RATIO = 0.5
+
+
+def as_keyword_list(value):
+    """Normalize a keywords cell (list, stringified list or comma-separated string) to a list"""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, (tuple, np.ndarray)):
+        return list(value)
+    if isinstance(value, str):
+        # Handle case where keywords might be stored as string
+        try:
+            parsed = ast.literal_eval(value)
+            if isinstance(parsed, (list, tuple)):
+                return list(parsed)
+        except (ValueError, SyntaxError):
+            pass
+        return value.split(',')
+    return []
+
+
+class KeywordVocabulary:
+    """Append-only mapping between keywords and int32 ids, shared by all compact frames"""
+
+    def __init__(self):
+        self._ids = {}
+        self._words = []
+        self._word_table = np.array([], dtype=object)
+        self._arrow_words = pa.array([], type=pa.string())
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._words)
+
+    def encode(self, keyword_lists):
+        """Encode an iterable of keyword lists as an Arrow list<int32> array"""
+        lengths = []
+        ids = []
+        with self._lock:
+            vocabulary = self._ids
+            words = self._words
+            for keywords in keyword_lists:
+                keywords = as_keyword_list(keywords)
+                lengths.append(len(keywords))
+                for word in keywords:
+                    word_id = vocabulary.get(word)
+                    if word_id is None:
+                        word_id = vocabulary[word] = len(words)
+                        words.append(word)
+                    ids.append(word_id)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int32)
+        np.cumsum(lengths, out=offsets[1:])
+        return pa.ListArray.from_arrays(pa.array(offsets), pa.array(ids, type=pa.int32()))
+
+    def words(self, ids):
+        """Map an array of ids to an object array of keywords"""
+        with self._lock:
+            if len(self._word_table) != len(self._words):
+                # Rebuilt like the Arrow table in to_arrow, only after words were added
+                self._word_table = np.array(self._words, dtype=object)
+            table = self._word_table
+        return table[np.asarray(ids, dtype=np.int64)]
+
+    def decode(self, column):
+        """Decode a compact keywords column back to a list of keyword lists"""
+        array = _arrow_array(column)
+        offsets = array.offsets.to_numpy() - array.offsets[0].as_py()
+        words = self.words(pc.list_flatten(array).to_numpy(zero_copy_only=False)).tolist()
+        return [words[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+    def to_arrow(self, column):
+        """Decode a compact keywords column to an Arrow list<string> array, without Python lists"""
+        array = _arrow_array(column)
+        with self._lock:
+            if len(self._arrow_words) != len(self._words):
+                # Append-only, so the cached array is only stale when words were added
+                self._arrow_words = pa.array(self._words, type=pa.string())
+            words = self._arrow_words
+        offsets = pc.subtract(array.offsets, array.offsets[0])
+        return pa.ListArray.from_arrays(offsets, words.take(pc.list_flatten(array)))
+
+
+_vocabulary = KeywordVocabulary()
+
+
+def get_keyword_vocabulary():
+    return _vocabulary
+
+
+def _arrow_array(column):
+    array = column if isinstance(column, (pa.Array, pa.ChunkedArray)) else pa.array(column)
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks() if array.num_chunks else pa.array([], type=array.type)
+    return array
+
+
+def is_compact(df):
+    return 'keywords' in df.columns and df['keywords'].dtype == pd.ArrowDtype(KEYWORD_IDS_TYPE)
+
+
+def _date_strings(dates):
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates.dt.strftime(DATE_FORMAT)
+    return dates.astype(str)
+
+
+def _compact_dates(dates, parse=True):
+    # Parse each distinct value once; keep datetime64 only if it is lossless
+    codes, uniques = pd.factorize(_date_strings(dates))
+    if parse and len(uniques):
+        parsed = pd.to_datetime(uniques, format=DATE_FORMAT, errors='coerce')
+        if parsed.notna().all() and (parsed.strftime(DATE_FORMAT) == uniques).all():
+            return pd.Series(parsed.take(codes), index=dates.index)
+    return pd.Series(pd.Categorical.from_codes(codes, categories=uniques), index=dates.index)
+
+
+def _compact_labels(values):
+    if values.dtype == STRING_DTYPE:
+        return values
+    categorical = isinstance(values.dtype, pd.CategoricalDtype)
+    distinct = len(values.cat.categories) if categorical else values.nunique(dropna=False)
+    if distinct > MAX_CATEGORY_RATIO * len(values):
+        return values.astype(object).astype(STRING_DTYPE)
+    return values if categorical else values.astype('category')
+
+
+def compact_results(df, vocabulary=None):
+    """Return a compact copy of a results frame (see module docstring)"""
+    if is_compact(df):
+        return df
+    vocabulary = vocabulary or _vocabulary
+    compact = {}
+    for column in df.columns:
+        values = df[column]
+        if column in DERIVED_COLUMNS:
+            continue
+        elif column == 'text':
+            compact[column] = values.astype(str).astype(STRING_DTYPE)
+        elif column == 'sentiment':
+            compact[column] = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype('category')
+        elif column == 'source':
+            compact[column] = _compact_labels(values)
+        elif column in FLOAT_COLUMNS:
+            compact[column] = values.astype(np.float32)
+        elif column == 'date':
+            compact[column] = _compact_dates(values)
+        elif column == 'cluster_id':
+            compact[column] = values.astype('Int64')
+        elif column == 'keywords':
+            compact[column] = pd.Series(
+                pd.arrays.ArrowExtensionArray(vocabulary.encode(values)), index=df.index
+            )
+        else:
+            compact[column] = values
+    return pd.DataFrame(compact, index=df.index)
+
+
+def expand_results(df, explanations=False, vocabulary=None):
+    """Convert a compact frame back to the public results layout used by exports"""
+    if not is_compact(df):
+        expanded = df.copy()
+    else:
+        vocabulary = vocabulary or _vocabulary
+        expanded = pd.DataFrame(index=df.index)
+        for column in df.columns:
+            values = df[column]
+            if column in ('text',) + LABEL_COLUMNS:
+                expanded[column] = values.astype(object)
+            elif column == 'date':
+                expanded[column] = _date_strings(values).astype(object)
+            elif column == 'keywords':
+                expanded[column] = pd.Series(vocabulary.decode(values), index=df.index, dtype=object)
+            else:
+                expanded[column] = values
+    if explanations and 'explanation' not in expanded.columns:
+        from sentiment_analyzer import get_sentiment_explanations
+        expanded['explanation'] = get_sentiment_explanations(
+            expanded['text'], expanded['sentiment'], expanded['polarity']
+        )
+    return expanded
+
+
+def concat_results(frames):
+    """Concatenate compact frames, keeping categorical and datetime columns compact"""
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    date_dtypes = {str(frame['date'].dtype) for frame in frames if 'date' in frame.columns}
+    if len(date_dtypes) > 1:
+        # Mixed parsed/unparsed dates fall back to categorical strings
+        frames = [
+            frame.assign(date=_compact_dates(frame['date'], parse=False)) if 'date' in frame.columns else frame
+            for frame in frames
+        ]
+    columns = list(dict.fromkeys(column for frame in frames for column in frame.columns))
+    for column in columns:
+        dtypes = [frame[column].dtype for frame in frames if column in frame.columns]
+        if any(dtype == STRING_DTYPE for dtype in dtypes):
+            # A high-cardinality chunk turns the whole column into strings
+            frames = [
+                frame.assign(**{column: frame[column].astype(STRING_DTYPE)}) if column in frame.columns else frame
+                for frame in frames
+            ]
+        elif all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+            # Unify categories so the result stays categorical instead of object
+            categories = pd.Index(pd.unique(np.concatenate([np.asarray(dtype.categories, dtype=object) for dtype in dtypes])))
+            frames = [
+                frame.assign(**{column: frame[column].cat.set_categories(categories)}) if column in frame.columns else frame
+                for frame in frames
+            ]
+    combined = pd.concat(frames, ignore_index=True)
+    if 'cluster_id' in combined.columns:
+        # Frames without the column leave NaN behind, which would make it float
+        combined['cluster_id'] = combined['cluster_id'].astype('Int64')
+    for column in combined.columns:
+        if isinstance(combined[column].dtype, pd.ArrowDtype):
+            # One contiguous buffer per column: gathers (take) over a chunked
+            # array pay a per-chunk cost on every page of a large store
+            combined[column] = pd.arrays.ArrowExtensionArray(_arrow_array(combined[column]))
+    return combined
+
+
+def keyword_frequencies(df, vocabulary=None):
+    """(keyword, count) pairs, most common first with ties in first-seen order"""
+    if 'keywords' not in df.columns or df.empty:
+        return []
+    if is_compact(df):
+        vocabulary = vocabulary or _vocabulary
+        ids = pc.list_flatten(_arrow_array(df['keywords'])).to_numpy(zero_copy_only=False)
+        if len(ids) == 0:
+            return []
+        unique_ids, first_seen, counts = np.unique(ids, return_index=True, return_counts=True)
+        order = np.lexsort((first_seen, -counts))
+        words = vocabulary.words(unique_ids[order])
+        return list(zip(words.tolist(), counts[order].tolist()))
+    # Plain frames: same ordering as Counter.most_common
+    counts = {}
+    for keywords in df['keywords']:
+        for word in as_keyword_list(keywords):
+            counts[word] = counts.get(word, 0) + 1
+    return sorted(counts.items(), key=lambda item: -item[1])
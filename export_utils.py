@@ -1,18 +1,32 @@
 import pandas as pd
+import numpy as np
 import json
 import csv
 import io
+import os
+import codecs
+import tempfile
 from datetime import datetime
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
-import plotly.express as px
-from visualizations import create_sentiment_metrics_summary
+import pyarrow as pa
+from compact_results import DATE_FORMAT, FLOAT_COLUMNS, as_keyword_list, expand_results, get_keyword_vocabulary
+from summary_metrics import combine_sentiment_metrics, create_sentiment_metrics_summary
+from sentiment_analyzer import iter_chunks
+
+# Rows expanded and serialized per block by the streaming exporters
+DEFAULT_EXPORT_CHUNK_SIZE = 50000
+
+# Excel's row limit per worksheet, header row included
+EXCEL_MAX_ROWS = 1048576
+EXCEL_SHEET_NAME = 'Sentiment Analysis'
+
+# Codec of the columnar exports unless another one is requested
+COLUMNAR_COMPRESSION = 'zstd'
+
+# Columns written dictionary-encoded by the columnar exports
+DICTIONARY_COLUMNS = ('sentiment', 'source', 'date')
+
+# Compression codecs of the streaming exporters and their file suffixes
+EXPORT_COMPRESSIONS = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
 
 def export_to_csv(df, filename=None):
     """Export dataframe to CSV format"""
@@ -22,14 +36,246 @@ def export_to_csv(df, filename=None):
     csv_data = df.to_csv(index=False)
     return csv_data, filename
 
+def _export_filename(extension, compression=None):
+    return f"sentiment_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}{EXPORT_COMPRESSIONS[compression]}"
+
+def _iter_blocks(frames, chunk_size):
+    if isinstance(frames, pd.DataFrame):
+        if not len(frames):
+            # Still yield the (empty) layout so the export has its header
+            yield frames
+            return
+        frames = [frames]
+    for df in frames:
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+
+def iter_export_frames(frames, chunk_size=DEFAULT_EXPORT_CHUNK_SIZE, explanations=False):
+    """Yield blocks of at most chunk_size rows in the public results layout.
+
+    frames is a results DataFrame (compact or not) or an iterable of them,
+    such as the chunks of iter_analyze. Compact results are expanded one
+    block at a time, so the expanded copy never exists in full.
+    """
+    for block in _iter_blocks(frames, chunk_size):
+        yield expand_results(block, explanations=explanations)
+
+def iter_csv_chunks(frames, chunk_size=DEFAULT_EXPORT_CHUNK_SIZE, explanations=False):
+    """Yield the CSV export as text blocks: the header with the first rows, then chunk_size rows at a time"""
+    for number, block in enumerate(iter_export_frames(frames, chunk_size, explanations)):
+        yield _csv_block(block, number)
+
+def _csv_block(block, number):
+    return block.to_csv(index=False, header=number == 0)
+
+def _json_floats(df):
+    """Copy of df with its float32 columns widened to float64 without the widening noise.
+
+    float32 0.65 widens to 0.6499999761581421. float32 holds about seven
+    significant digits and the stored scores are within [-1, 1], so
+    rounding to seven decimals gives back the value that was meant.
+    """
+    columns = {
+        column: np.round(df[column].to_numpy(dtype=np.float64), 7)
+        for column in df.columns if df[column].dtype == np.float32
+    }
+    return df.assign(**columns) if columns else df
+
+def iter_ndjson_chunks(frames, chunk_size=DEFAULT_EXPORT_CHUNK_SIZE, explanations=False):
+    """Yield the newline-delimited JSON export (one object per row) as text blocks of chunk_size rows"""
+    for number, block in enumerate(iter_export_frames(frames, chunk_size, explanations)):
+        yield _ndjson_block(block, number)
+
+def _ndjson_block(block, number):
+    # pandas' C serializer handles the numeric and keyword list columns
+    # without a Python object per value
+    if not len(block):
+        return ''
+    return _json_floats(block).to_json(orient='records', lines=True, force_ascii=False, double_precision=15)
+
+def open_export_file(path, compression=None):
+    """Open path for binary writing, compressing on the fly with gzip or zstd"""
+    if compression not in EXPORT_COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}', expected one of {list(EXPORT_COMPRESSIONS)}")
+    if compression is None:
+        return open(path, 'wb')
+    return pa.CompressedOutputStream(path, compression)
+
+def _write_blocks(serialize, frames, path, compression, chunk_size, explanations):
+    rows = 0
+    with open_export_file(path, compression) as handle:
+        for number, block in enumerate(iter_export_frames(frames, chunk_size, explanations)):
+            handle.write(serialize(block, number).encode('utf-8'))
+            rows += len(block)
+    return rows
+
+def write_csv(frames, path, compression=None, chunk_size=DEFAULT_EXPORT_CHUNK_SIZE, explanations=False):
+    """Stream the CSV export of frames to path block by block; returns the number of rows written"""
+    return _write_blocks(_csv_block, frames, path, compression, chunk_size, explanations)
+
+def write_ndjson(frames, path, compression=None, chunk_size=DEFAULT_EXPORT_CHUNK_SIZE, explanations=False):
+    """Stream the NDJSON export of frames to path block by block; returns the number of rows written"""
+    return _write_blocks(_ndjson_block, frames, path, compression, chunk_size, explanations)
+
+def _export_file(write, extension, df, filename, compression, directory, chunk_size, explanations):
+    if filename is None:
+        filename = _export_filename(extension, compression)
+    directory = directory or tempfile.mkdtemp(prefix='sentiment_export_')
+    path = os.path.join(directory, filename)
+    write(df, path, compression, chunk_size, explanations)
+    return path, filename
+
+def export_csv_file(df, filename=None, compression=None, directory=None, chunk_size=DEFAULT_EXPORT_CHUNK_SIZE,
+                    explanations=False):
+    """Write the CSV export to a file on disk and return (path, filename).
+
+    Unlike export_to_csv the data never exists as one string; downloads
+    and the CLI read it back from the file. directory defaults to a new
+    temporary directory, which the caller removes when done.
+    """
+    return _export_file(write_csv, 'csv', df, filename, compression, directory, chunk_size, explanations)
+
+def export_ndjson_file(df, filename=None, compression=None, directory=None, chunk_size=DEFAULT_EXPORT_CHUNK_SIZE,
+                       explanations=False):
+    """Write the NDJSON export to a file on disk and return (path, filename) (see export_csv_file)"""
+    return _export_file(write_ndjson, 'ndjson', df, filename, compression, directory, chunk_size, explanations)
+
+class _GrowingDictionary:
+    """Dictionary encoder whose dictionary only ever grows.
+
+    Arrow IPC files allow one dictionary per column plus deltas, so every
+    record batch is encoded against the dictionary of the previous batches
+    with new values appended at the end.
+    """
+
+    def __init__(self):
+        self._values = pd.Index([], dtype=object)
+        self._dictionary = pa.array([], type=pa.string())
+
+    def encode(self, values):
+        categorical = values.array if isinstance(values.dtype, pd.CategoricalDtype) else pd.Categorical(values)
+        categories = categorical.categories
+        if isinstance(categories, pd.DatetimeIndex):
+            categories = categories.strftime(DATE_FORMAT)
+        categories = pd.Index(categories.astype(str), dtype=object)
+        positions = self._values.get_indexer(categories)
+        if (positions < 0).any():
+            self._values = self._values.append(categories[positions < 0])
+            self._dictionary = pa.array(self._values, type=pa.string())
+            positions = self._values.get_indexer(categories)
+        codes = categorical.codes
+        indices = pa.array(positions.astype(np.int32)[codes], mask=codes < 0, type=pa.int32())
+        return pa.DictionaryArray.from_arrays(indices, self._dictionary)
+
+def _arrow_column(name, values, encoders):
+    if name in DICTIONARY_COLUMNS:
+        return encoders.setdefault(name, _GrowingDictionary()).encode(values)
+    if name == 'keywords':
+        if isinstance(values.dtype, pd.ArrowDtype):
+            return get_keyword_vocabulary().to_arrow(values)
+        return pa.array([as_keyword_list(value) for value in values], type=pa.list_(pa.string()))
+    if name in FLOAT_COLUMNS:
+        return pa.array(values.to_numpy(dtype=np.float32, na_value=np.nan), type=pa.float32())
+    if name == 'cluster_id':
+        return pa.array(values, type=pa.int64(), from_pandas=True)
+    if name in ('text', 'explanation'):
+        return pa.array(values, type=pa.string(), from_pandas=True)
+    return pa.array(values, from_pandas=True)
+
+def iter_record_batches(frames, chunk_size=DEFAULT_EXPORT_CHUNK_SIZE, explanations=False):
+    """Yield the columnar export as Arrow record batches of chunk_size rows.
+
+    keywords is a native list<string> column, sentiment, source and date
+    are dictionary-encoded strings and the scores stay float32. Compact
+    results are converted column by column without per-row Python objects.
+    """
+    encoders = {}
+    for block in _iter_blocks(frames, chunk_size):
+        columns = {name: block[name] for name in block.columns}
+        if explanations and 'explanation' not in columns:
+            columns['explanation'] = expand_results(block[['text', 'sentiment', 'polarity']], explanations=True)['explanation']
+        arrays = [_arrow_column(name, values, encoders) for name, values in columns.items()]
+        yield pa.RecordBatch.from_arrays(arrays, names=list(columns))
+
+def write_parquet(frames, path, compression=None, chunk_size=DEFAULT_EXPORT_CHUNK_SIZE, explanations=False):
+    """Stream the Parquet export of frames to path, one row group per block; returns the number of rows written.
+
+    compression is the Parquet codec, zstd by default.
+    """
+    import pyarrow.parquet as pq
+    rows = 0
+    writer = None
+    try:
+        for batch in iter_record_batches(frames, chunk_size, explanations):
+            if writer is None:
+                writer = pq.ParquetWriter(path, batch.schema, compression=compression or COLUMNAR_COMPRESSION)
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+def write_arrow(frames, path, compression=None, chunk_size=DEFAULT_EXPORT_CHUNK_SIZE, explanations=False):
+    """Stream the Arrow IPC (Feather v2) export of frames to path, one record batch per block.
+
+    compression is the IPC buffer codec, zstd (the default) or lz4.
+    Returns the number of rows written.
+    """
+    import pyarrow.ipc as ipc
+    compression = compression or COLUMNAR_COMPRESSION
+    if compression not in ('zstd', 'lz4'):
+        raise ValueError(f"Arrow IPC files support zstd or lz4 compression, not '{compression}'")
+    options = ipc.IpcWriteOptions(compression=compression, emit_dictionary_deltas=True)
+    rows = 0
+    writer = None
+    try:
+        for batch in iter_record_batches(frames, chunk_size, explanations):
+            if writer is None:
+                writer = ipc.new_file(path, batch.schema, options=options)
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+def export_parquet_file(df, filename=None, compression=None, directory=None, chunk_size=DEFAULT_EXPORT_CHUNK_SIZE,
+                        explanations=False):
+    """Write the Parquet export to a file on disk and return (path, filename) (see export_csv_file)"""
+    # The codec is inside the file, so the name has no compression suffix
+    filename = filename or _export_filename('parquet')
+    return _export_file(write_parquet, 'parquet', df, filename, compression, directory, chunk_size, explanations)
+
+def export_arrow_file(df, filename=None, compression=None, directory=None, chunk_size=DEFAULT_EXPORT_CHUNK_SIZE,
+                      explanations=False):
+    """Write the Arrow IPC export to a file on disk and return (path, filename) (see export_csv_file)"""
+    filename = filename or _export_filename('arrow')
+    return _export_file(write_arrow, 'arrow', df, filename, compression, directory, chunk_size, explanations)
+
 def export_to_json(df, filename=None):
     """Export dataframe to JSON format"""
     if filename is None:
         filename = f"sentiment_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     
-    json_data = df.to_json(orient='records', indent=2)
+    json_data = _json_floats(df).to_json(orient='records', indent=2, double_precision=15)
     return json_data, filename
 
+def _summary_rows(metrics):
+    """(Metric, Value) rows of the Excel Summary sheet"""
+    return [
+        ('Total Texts', metrics['total_texts']),
+        ('Positive Count', metrics['positive_count']),
+        ('Negative Count', metrics['negative_count']),
+        ('Neutral Count', metrics['neutral_count']),
+        ('Positive Percentage', f"{metrics['positive_pct']:.1f}%"),
+        ('Negative Percentage', f"{metrics['negative_pct']:.1f}%"),
+        ('Neutral Percentage', f"{metrics['neutral_pct']:.1f}%"),
+        ('Average Confidence', f"{metrics['avg_confidence']:.3f}"),
+        ('Average Polarity', f"{metrics['avg_polarity']:.3f}"),
+        ('Average Subjectivity', f"{metrics['avg_subjectivity']:.3f}"),
+    ]
+
 def export_to_excel(df, filename=None):
     """Export dataframe to Excel format"""
     if filename is None:
@@ -38,44 +284,104 @@ def export_to_excel(df, filename=None):
     output = io.BytesIO()
     with pd.ExcelWriter(output, engine='openpyxl') as writer:
         # Main data sheet
-        df.to_excel(writer, sheet_name='Sentiment Analysis', index=False)
+        df.to_excel(writer, sheet_name=EXCEL_SHEET_NAME, index=False)
         
         # Summary sheet
         metrics = create_sentiment_metrics_summary(df)
-        summary_data = {
-            'Metric': [
-                'Total Texts',
-                'Positive Count',
-                'Negative Count',
-                'Neutral Count',
-                'Positive Percentage',
-                'Negative Percentage',
-                'Neutral Percentage',
-                'Average Confidence',
-                'Average Polarity',
-                'Average Subjectivity'
-            ],
-            'Value': [
-                metrics['total_texts'],
-                metrics['positive_count'],
-                metrics['negative_count'],
-                metrics['neutral_count'],
-                f"{metrics['positive_pct']:.1f}%",
-                f"{metrics['negative_pct']:.1f}%",
-                f"{metrics['neutral_pct']:.1f}%",
-                f"{metrics['avg_confidence']:.3f}",
-                f"{metrics['avg_polarity']:.3f}",
-                f"{metrics['avg_subjectivity']:.3f}"
-            ]
-        }
-        summary_df = pd.DataFrame(summary_data)
+        summary_df = pd.DataFrame(_summary_rows(metrics), columns=['Metric', 'Value'])
         summary_df.to_excel(writer, sheet_name='Summary', index=False)
     
     excel_data = output.getvalue()
     return excel_data, filename
 
+def _excel_values(block):
+    """Rows of a block as lists of cell values openpyxl accepts"""
+    columns = []
+    for column in block.columns:
+        values = block[column]
+        if values.dtype == np.float32:
+            # Same widening fix as the JSON export
+            values = pd.Series(np.round(values.to_numpy(dtype=np.float64), 7), index=values.index)
+        if values.dtype == object:
+            # Keyword lists as their repr, like pandas' Excel writer
+            values = values.map(lambda value: str(value) if isinstance(value, (list, tuple)) else value)
+        columns.append(values.astype(object).where(values.notna(), None).tolist())
+    return zip(*columns)
+
+def write_excel(frames, path, compression=None, chunk_size=DEFAULT_EXPORT_CHUNK_SIZE, explanations=False,
+                max_rows=EXCEL_MAX_ROWS):
+    """Stream the Excel export of frames to path; returns the number of rows written.
+
+    Uses openpyxl's write-only mode, which writes rows out as they are
+    appended instead of keeping a cell object per value, so memory stays
+    bounded by the block size. Rows beyond a sheet's max_rows (Excel's
+    limit by default) continue on "Sentiment Analysis 2", 3, ... The
+    Summary sheet is built from per-block metrics and comes last.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, Side
+    
+    if compression is not None:
+        raise ValueError("Excel files are already compressed; compression is not supported")
+    workbook = Workbook(write_only=True)
+    side = Side(style='thin')
+    # pandas' header style, so the sheets look like export_to_excel's
+    header_font = Font(bold=True)
+    header_border = Border(left=side, right=side, top=side, bottom=side)
+    header_alignment = Alignment(horizontal='center', vertical='top')
+    
+    def add_sheet(title, header):
+        sheet = workbook.create_sheet(title)
+        cells = []
+        for name in header:
+            cell = WriteOnlyCell(sheet, value=name)
+            cell.font, cell.border, cell.alignment = header_font, header_border, header_alignment
+            cells.append(cell)
+        sheet.append(cells)
+        return sheet
+    
+    rows = 0
+    sheet = None
+    sheet_rows = 0
+    partials = []
+    for block in iter_export_frames(frames, chunk_size, explanations):
+        partials.append(create_sentiment_metrics_summary(block))
+        if sheet is None:
+            sheet = add_sheet(EXCEL_SHEET_NAME, block.columns)
+            sheets = 1
+        for row in _excel_values(block):
+            if sheet_rows == max_rows - 1:
+                sheets += 1
+                sheet = add_sheet(f"{EXCEL_SHEET_NAME} {sheets}", block.columns)
+                sheet_rows = 0
+            sheet.append(row)
+            sheet_rows += 1
+        rows += len(block)
+    
+    summary = add_sheet('Summary', ['Metric', 'Value'])
+    metrics = combine_sentiment_metrics(partials)
+    if metrics:
+        for row in _summary_rows(metrics):
+            summary.append(row)
+    workbook.save(path)
+    return rows
+
+def export_excel_file(df, filename=None, compression=None, directory=None, chunk_size=DEFAULT_EXPORT_CHUNK_SIZE,
+                      explanations=False):
+    """Write the Excel export to a file on disk and return (path, filename) (see export_csv_file)"""
+    return _export_file(write_excel, 'xlsx', df, filename, compression, directory, chunk_size, explanations)
+
 def create_pdf_report(df, filename=None):
     """Create a comprehensive PDF report"""
+    # reportlab is only needed here, so CSV/JSON/Excel exports never load it
+    from reportlab.lib.pagesizes import letter, A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT
+    
     if filename is None:
         filename = f"sentiment_analysis_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
     
@@ -219,27 +525,208 @@ def create_pdf_report(df, filename=None):
     
     return pdf_data, filename
 
-def batch_process_files(uploaded_files):
-    """Process multiple uploaded files for batch analysis"""
+# Rows per chunk when streaming uploads and input files into the analyzer
+DEFAULT_INGEST_CHUNK_SIZE = 10000
+
+def _iter_lines(file):
+    """Yield decoded lines from a path or a binary file-like object"""
+    if isinstance(file, str):
+        with open(file, encoding='utf-8') as handle:
+            yield from handle
+    elif isinstance(file, pa.NativeFile):
+        yield from io.TextIOWrapper(file, encoding='utf-8')
+    else:
+        yield from codecs.iterdecode(file, 'utf-8')
+
+class _KeepOpen:
+    """File proxy whose close() leaves the wrapped file open.
+
+    pyarrow streams close the Python file they read from, but a job still
+    reads the upload's position for its progress afterwards.
+    """
+
+    def __init__(self, file):
+        self._file = file
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    @property
+    def closed(self):
+        return False
+
+    def close(self):
+        pass
+
+def _read_csv_frames(file, file_name, chunk_size, columns):
+    wanted = {column for column in columns if column}
+    yield from pd.read_csv(file, chunksize=chunk_size, usecols=lambda column: column in wanted)
+
+def _read_txt_frames(file, file_name, chunk_size, columns):
+    lines = (line.strip() for line in _iter_lines(file))
+    for chunk in iter_chunks((line for line in lines if line), chunk_size):
+        yield pd.DataFrame({columns[0]: chunk})
+
+def _read_jsonl_frames(file, file_name, chunk_size, columns):
+    text_column = columns[0]
+    rows = ((number, json.loads(line)) for number, line in enumerate(_iter_lines(file), 1) if line.strip())
+    for chunk in iter_chunks(rows, chunk_size):
+        for number, row in chunk:
+            if text_column not in row:
+                raise ValueError(f"{file_name} line {number} has no '{text_column}' field")
+        yield pd.DataFrame({
+            column: [row.get(column) for _, row in chunk] for column in columns if column
+        })
+
+def _arrow_frame(batch):
+    """DataFrame of a record batch with dates and timestamps as DATE_FORMAT strings"""
+    import pyarrow.compute as pc
+    arrays = [
+        pc.strftime(array, format=DATE_FORMAT) if pa.types.is_temporal(array.type) else array
+        for array in batch.columns
+    ]
+    return pa.RecordBatch.from_arrays(arrays, names=batch.schema.names).to_pandas()
+
+def _projection(schema, file_name, columns):
+    if columns[0] not in schema.names:
+        raise ValueError(f"{file_name} must contain a '{columns[0]}' column")
+    return [column for column in dict.fromkeys(columns) if column and column in schema.names]
+
+def _read_parquet_frames(file, file_name, chunk_size, columns):
+    # Only the projected columns of one batch of rows are decoded at a time
+    import pyarrow.parquet as pq
+    parquet = pq.ParquetFile(file)
+    projection = _projection(parquet.schema_arrow, file_name, columns)
+    for batch in parquet.iter_batches(batch_size=chunk_size, columns=projection):
+        yield _arrow_frame(batch)
+
+def _read_arrow_frames(file, file_name, chunk_size, columns):
+    import pyarrow.ipc as ipc
+    # A memory map pages record batches in as they are read
+    source = pa.memory_map(file) if isinstance(file, str) else file
+    try:
+        reader = ipc.open_file(source)
+        batches = (reader.get_batch(number) for number in range(reader.num_record_batches))
+    except pa.ArrowInvalid:
+        # Arrow IPC stream format (e.g. .arrows written by a streaming producer)
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        reader = ipc.open_stream(source)
+        batches = iter(reader)
+    projection = _projection(reader.schema, file_name, columns)
+    for batch in batches:
+        batch = batch.select(projection)
+        for start in range(0, batch.num_rows, chunk_size):
+            yield _arrow_frame(batch.slice(start, chunk_size))
+
+# Readers by file extension: reader(file, file_name, chunk_size, columns)
+# yields DataFrames of at most chunk_size rows, holding only the columns
+# among (text, source, date) that the input has
+INPUT_READERS = {
+    '.csv': _read_csv_frames,
+    '.txt': _read_txt_frames,
+    '.jsonl': _read_jsonl_frames,
+    '.parquet': _read_parquet_frames,
+    '.arrow': _read_arrow_frames,
+    '.arrows': _read_arrow_frames,
+    '.feather': _read_arrow_frames,
+}
+
+# Columnar formats are compressed internally and need random access
+SEEKABLE_INPUTS = ('.parquet', '.arrow', '.feather')
+
+INPUT_COMPRESSIONS = ('.gz', '.zst', '.zip')
+
+# Extensions to accept for uploads; the type inside .gz/.zst names is
+# checked when the file is read
+INPUT_EXTENSIONS = tuple(INPUT_READERS) + INPUT_COMPRESSIONS
+
+def _iter_input_frames(file, file_name, chunk_size, columns):
+    base, compression = os.path.splitext(file_name.lower())
+    if compression == '.zip':
+        # Every supported member of the archive, in archive order
+        import zipfile
+        with zipfile.ZipFile(file) as archive:
+            for member in archive.infolist():
+                if member.is_dir() or os.path.splitext(member.filename.lower())[1] not in INPUT_READERS:
+                    continue
+                with archive.open(member) as handle:
+                    for _, frame in _iter_input_frames(handle, member.filename, chunk_size, columns):
+                        yield os.path.basename(member.filename), frame
+        return
+    if compression in INPUT_COMPRESSIONS:
+        extension = os.path.splitext(base)[1]
+        if extension in SEEKABLE_INPUTS:
+            raise ValueError(f"{file_name}: {extension} files are compressed internally, read them uncompressed")
+        if compression == '.gz':
+            import gzip
+            file = gzip.open(file, 'rb')
+        else:
+            file = pa.CompressedInputStream(file if isinstance(file, str) else _KeepOpen(file), 'zstd')
+    else:
+        extension = compression
+    if extension not in INPUT_READERS:
+        raise ValueError(f"Unsupported input file type: {os.path.basename(file_name)}")
+    for frame in INPUT_READERS[extension](file, os.path.basename(file_name), chunk_size, columns):
+        yield None, frame
+
+def iter_text_record_chunks(file, name=None, chunk_size=DEFAULT_INGEST_CHUNK_SIZE, text_column='text',
+                            source_column='source', date_column='date', default_source=None, default_date=None):
+    """Yield lists of {'text', 'source', 'date'} dicts from an input file.
+
+    file is a path or a binary file-like object such as a Streamlit upload
+    (name then gives the file type). CSV, TXT, JSONL, Parquet and Arrow
+    IPC/Feather inputs are supported, as are gzip/zstd-compressed CSV, TXT
+    and JSONL and zip archives of any of them (see INPUT_READERS). Inputs
+    are read chunk_size rows at a time and only the text/source/date
+    columns are parsed, so memory stays bounded by the chunk size rather
+    than the file size. Missing sources fall back to default_source (the
+    file name, or the member name inside a zip) and missing dates to
+    default_date (today).
+    """
+    name = name or getattr(file, 'name', None) or str(file)
+    file_name = os.path.basename(name)
+    default_date = default_date if default_date is not None else str(datetime.now().date())
+    columns = (text_column, source_column, date_column)
+    
+    for member, chunk in _iter_input_frames(file, file_name, chunk_size, columns):
+        if text_column not in chunk.columns:
+            raise ValueError(f"{member or file_name} must contain a '{text_column}' column")
+        source = default_source if default_source is not None else (member or file_name)
+        count = len(chunk)
+        texts = pd.Series(chunk[text_column].values, dtype=object).astype(str)
+        if source_column in chunk.columns:
+            sources = pd.Series(chunk[source_column].values, dtype=object).fillna(source).astype(str)
+        else:
+            sources = [source] * count
+        if date_column in chunk.columns:
+            dates = pd.Series(chunk[date_column].values, dtype=object).fillna(default_date).astype(str)
+        else:
+            dates = [default_date] * count
+        yield [
+            {'text': text, 'source': source, 'date': date}
+            for text, source, date in zip(texts, sources, dates)
+        ]
+
+def batch_process_files(uploaded_files, chunk_size=DEFAULT_INGEST_CHUNK_SIZE):
+    """Read uploaded files of any supported input type into one text/source/date DataFrame.
+
+    Files are read chunk by chunk with column projection; use
+    iter_text_record_chunks directly to analyze them without holding all
+    rows at once.
+    """
     all_results = []
     
     for uploaded_file in uploaded_files:
         try:
-            if uploaded_file.name.endswith('.csv'):
-                df = pd.read_csv(uploaded_file)
-                if 'text' in df.columns:
-                    # Add file source information
-                    df['file_source'] = uploaded_file.name
-                    all_results.append(df)
-            elif uploaded_file.name.endswith('.txt'):
-                # Read text file line by line
-                content = uploaded_file.read().decode('utf-8')
-                lines = [line.strip() for line in content.split('\n') if line.strip()]
-                df = pd.DataFrame({
-                    'text': lines,
-                    'file_source': uploaded_file.name
-                })
-                all_results.append(df)
+            frames = [
+                pd.DataFrame(records, columns=['text', 'source', 'date'])
+                for records in iter_text_record_chunks(uploaded_file, chunk_size=chunk_size)
+            ]
+            for df in frames:
+                # Add file source information
+                df['file_source'] = uploaded_file.name
+            all_results.extend(frames)
         except Exception as e:
             print(f"Error processing file {uploaded_file.name}: {str(e)}")
     
@@ -249,3 +736,7 @@ def batch_process_files(uploaded_files):
     else:
         return pd.DataFrame()
 
+def read_text_records(path, chunk_size=DEFAULT_INGEST_CHUNK_SIZE):
+    """Yield {'text', 'source', 'date'} dicts from any supported input file, one chunk at a time"""
+    for chunk in iter_text_record_chunks(path, chunk_size=chunk_size):
+        yield from chunk
@@ -0,0 +1,349 @@
+"""Background analysis jobs with progress, cancellation and resumable checkpoints.
+
+A job analyzes one or more input files chunk by chunk in a worker thread
+(optionally fanning each chunk out to a process pool through
+``batch_analyze_sentiment``). After every chunk the results are written to
+the job's checkpoint directory as a Parquet file and the manifest records
+how many chunks are done. A job is identified by a hash of its inputs and
+parameters, so submitting the same files again, after a cancellation, a
+failure or a server restart, reloads the finished chunks and continues
+with the first unfinished one.
+
+Dashboard sessions that upload the same inputs share one job. Each session
+subscribes with its own cursor into the finished chunks; chunks it has not
+taken yet stay in memory while another session has already moved past
+them and are otherwise read back from their checkpoints.
+"""
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from export_utils import DEFAULT_INGEST_CHUNK_SIZE, iter_text_record_chunks
+from sentiment_analyzer import ANALYZER_VERSION, batch_analyze_sentiment, dedup_stats
+
+# Set to a directory to keep job checkpoints somewhere other than the temp dir
+JOB_DIR_ENV = 'SENTIMENT_JOB_DIR'
+
+JOB_STATES = ('queued', 'running', 'completed', 'cancelled', 'failed')
+
+MANIFEST_NAME = 'manifest.json'
+
+_COPY_BLOCK_SIZE = 1024 * 1024
+
+
+def _write_atomic(path, write):
+    # Readers (and a resumed job) only ever see complete files
+    temporary = f"{path}.tmp"
+    write(temporary)
+    os.replace(temporary, path)
+
+
+def _iter_blocks(file):
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    while True:
+        block = file.read(_COPY_BLOCK_SIZE)
+        if not block:
+            break
+        yield block
+
+
+class AnalysisJob:
+    """One resumable analysis run over a list of input files"""
+
+    def __init__(self, job_id, directory, inputs, options, chunk_size, engine, workers):
+        self.id = job_id
+        self.directory = directory
+        self.inputs = inputs
+        self.options = options
+        self.chunk_size = chunk_size
+        self.engine = engine
+        self.workers = workers
+        self.status = 'queued'
+        self.error = None
+        self.rows = 0
+        self.analyzed_rows = 0
+        self.unique_texts = 0
+        self.chunks_done = 0
+        self.resumed_chunks = 0
+        # Chunks the manifest had when this run started
+        self._checkpointed = 0
+        self.total_bytes = sum(os.path.getsize(path) for _, path in inputs)
+        self.bytes_done = 0
+        self.started = None
+        self.finished = None
+        # Finished chunks some subscriber has not taken yet, by chunk number
+        self._results = {}
+        # Next chunk number to take, by subscriber
+        self._cursors = {}
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._thread = None
+
+    @property
+    def active(self):
+        return self.status in ('queued', 'running')
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def rows_per_second(self):
+        # Throughput of this run only; rows reloaded from checkpoints are free
+        elapsed = self.elapsed
+        return self.analyzed_rows / elapsed if elapsed else 0.0
+
+    @property
+    def dedup_ratio(self):
+        """Share of the rows analyzed in this run that were duplicates within their chunk"""
+        return dedup_stats(self.analyzed_rows, self.unique_texts)['dedup_ratio']
+
+    @property
+    def progress(self):
+        if self.status == 'completed':
+            return 1.0
+        return min(self.bytes_done / self.total_bytes, 1.0) if self.total_bytes else 0.0
+
+    @property
+    def subscribers(self):
+        with self._lock:
+            return list(self._cursors)
+
+    def pending_chunks(self, subscriber=None):
+        """Finished chunks whose results subscriber has not taken yet"""
+        with self._lock:
+            return max(self.chunks_done - self._cursors.get(subscriber, 0), 0)
+
+    def subscribe(self, subscriber=None):
+        """Start tracking subscriber's results, from the first chunk unless already subscribed"""
+        with self._lock:
+            self._cursors.setdefault(subscriber, 0)
+        return self
+
+    def unsubscribe(self, subscriber=None):
+        """Stop tracking subscriber and drop the chunks no one else is waiting for"""
+        with self._lock:
+            self._cursors.pop(subscriber, None)
+            self._drop_taken()
+
+    def start(self):
+        """Run the job in a daemon thread, continuing from its checkpoints"""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._cancel.clear()
+        self.status = 'queued'
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name=f"analysis-job-{self.id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Stop after the chunk in progress; finished chunks stay checkpointed"""
+        self._cancel.set()
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.status
+
+    def take_results(self, subscriber=None):
+        """Return the result frames finished since subscriber's last call, in input order"""
+        with self._lock:
+            start = self._cursors.get(subscriber, 0)
+            numbers = range(start, max(self.chunks_done, start))
+            self._cursors[subscriber] = numbers.stop
+            frames = [self._results.get(number) for number in numbers]
+            self._drop_taken()
+        # Chunks held only for slower subscribers, or reloaded before this one
+        # subscribed, come back from their checkpoints
+        return [
+            pd.read_parquet(self._chunk_path(number)) if frame is None else frame
+            for number, frame in zip(numbers, frames)
+        ]
+
+    def _drop_taken(self):
+        # Caller holds self._lock
+        first = min(self._cursors.values(), default=self.chunks_done)
+        for number in [number for number in self._results if number < first]:
+            del self._results[number]
+
+    def _wanted(self, number):
+        # Caller holds self._lock
+        return any(cursor <= number for cursor in self._cursors.values())
+
+    def _chunk_path(self, number):
+        return os.path.join(self.directory, f"chunk-{number:06d}.parquet")
+
+    def _save_manifest(self):
+        manifest = {
+            'id': self.id,
+            'status': self.status,
+            # A run interrupted while replaying checkpoints must not forget the rest
+            'chunks_done': max(self.chunks_done, self._checkpointed),
+            'rows': self.rows,
+            'error': self.error,
+        }
+        def write(path):
+            with open(path, 'w', encoding='utf-8') as handle:
+                json.dump(manifest, handle)
+        _write_atomic(os.path.join(self.directory, MANIFEST_NAME), write)
+
+    def _checkpointed_chunks(self):
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        if not os.path.exists(path):
+            return 0
+        with open(path, encoding='utf-8') as handle:
+            return json.load(handle).get('chunks_done', 0)
+
+    def _finish(self, status, error=None):
+        self.status = status
+        self.error = error
+        self.finished = time.perf_counter()
+        self._save_manifest()
+
+    def _run(self):
+        self.status = 'running'
+        self.started = time.perf_counter()
+        self.finished = None
+        self.analyzed_rows = self.unique_texts = 0
+        try:
+            checkpointed = self._checkpointed = self._checkpointed_chunks()
+            self.chunks_done = self.rows = self.resumed_chunks = 0
+            number = 0
+            offset = 0
+            for name, path in self.inputs:
+                # Close the reader before its file, also when cancelled mid-file
+                with open(path, 'rb') as handle, contextlib.closing(iter_text_record_chunks(
+                        handle, name=name, chunk_size=self.chunk_size, **self.options)) as chunks:
+                    for records in chunks:
+                        if self._cancel.is_set():
+                            self._finish('cancelled')
+                            return
+                        if number < checkpointed:
+                            # Finished before the interruption: reload instead of re-analyzing
+                            with self._lock:
+                                wanted = self._wanted(number)
+                            results = pd.read_parquet(self._chunk_path(number)) if wanted else None
+                            self.resumed_chunks += 1
+                        else:
+                            results = batch_analyze_sentiment(records, engine=self.engine, workers=self.workers)
+                            _write_atomic(self._chunk_path(number), lambda path: results.to_parquet(path, index=False))
+                            self.analyzed_rows += len(records)
+                            self.unique_texts += results.attrs['dedup']['unique_texts']
+                        with self._lock:
+                            if results is not None and self._wanted(number):
+                                self._results[number] = results
+                            self.chunks_done = number + 1
+                        self.rows += len(records)
+                        self.bytes_done = offset + handle.tell()
+                        if number >= checkpointed:
+                            self._save_manifest()
+                        number += 1
+                offset += os.path.getsize(path)
+            self._finish('completed')
+        except Exception as e:
+            self._finish('failed', str(e))
+
+
+class JobManager:
+    """Process-wide registry of analysis jobs and their checkpoint directories"""
+
+    def __init__(self, root=None):
+        self.root = root or os.environ.get(JOB_DIR_ENV) or os.path.join(tempfile.gettempdir(), 'sentiment_jobs')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, files, options=None, chunk_size=DEFAULT_INGEST_CHUNK_SIZE, engine='lexicon', workers=1,
+               subscriber=None):
+        """Start (or resume) a job over files, a list of (name, path or binary file) pairs.
+
+        options are passed to iter_text_record_chunks for every file. Uploads
+        are copied into the job directory so the job outlives the request
+        that submitted it. subscriber (e.g. a session id) is subscribed to
+        the job's results; see AnalysisJob.take_results.
+        """
+        options = dict(options or {})
+        # Fix the fallback date now so a resumed job labels rows like the original run
+        options.setdefault('default_date', str(datetime.now().date()))
+        digest = hashlib.blake2b(digest_size=12)
+        digest.update(json.dumps([ANALYZER_VERSION, engine, chunk_size, sorted(options.items())]).encode('utf-8'))
+        contents = []
+        for name, file in files:
+            file_digest = hashlib.blake2b(digest_size=16)
+            if isinstance(file, (str, os.PathLike)):
+                with open(file, 'rb') as handle:
+                    for block in _iter_blocks(handle):
+                        file_digest.update(block)
+            else:
+                for block in _iter_blocks(file):
+                    file_digest.update(block)
+            contents.append(file_digest.hexdigest())
+            digest.update(f"\0{name}\0{contents[-1]}".encode('utf-8'))
+        job_id = digest.hexdigest()
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and (job.active or job.status == 'completed'):
+                # A new subscriber replays the finished chunks from the checkpoints
+                return job.subscribe(subscriber)
+            directory = os.path.join(self.root, job_id)
+            os.makedirs(directory, exist_ok=True)
+            inputs = []
+            for number, ((name, file), content) in enumerate(zip(files, contents)):
+                path = os.path.join(directory, f"input-{number}-{content}{os.path.splitext(name)[1]}")
+                if not os.path.exists(path):
+                    if isinstance(file, (str, os.PathLike)):
+                        _write_atomic(path, lambda temporary: shutil.copyfile(file, temporary))
+                    else:
+                        def copy(temporary):
+                            with open(temporary, 'wb') as handle:
+                                for block in _iter_blocks(file):
+                                    handle.write(block)
+                        _write_atomic(path, copy)
+                inputs.append((name, path))
+            if job is None:
+                job = AnalysisJob(job_id, directory, inputs, options, chunk_size, engine, workers)
+                self._jobs[job_id] = job
+            job.subscribe(subscriber)
+        return job.start()
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def jobs(self):
+        return list(self._jobs.values())
+
+    def discard(self, job_id, subscriber=None):
+        """Unsubscribe from a job; forget it and delete its checkpoints once no one tracks it"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                if job.active and set(job.subscribers) <= {subscriber}:
+                    raise ValueError(f"Job {job_id} is still running")
+                job.unsubscribe(subscriber)
+                if job.subscribers:
+                    return
+            self._jobs.pop(job_id, None)
+            shutil.rmtree(os.path.join(self.root, job_id), ignore_errors=True)
+
+
+_default_manager = None
+
+
+def get_job_manager():
+    """Return the process-wide job manager, shared by every dashboard session"""
+    global _default_manager
+    if _default_manager is None:
+        _default_manager = JobManager()
+    return _default_manager
@@ -0,0 +1,34 @@
+"""Deferred imports for heavy, feature-specific dependencies.
+
+``lazy_module('matplotlib.pyplot')`` returns a proxy that imports the real
+module the first time one of its attributes is used, so plotting, word
+cloud, PDF and NLP libraries are only loaded by the code paths that need
+them instead of by every import of the modules that mention them.
+"""
+import importlib
+import sys
+
+
+class LazyModule:
+    """Module proxy that imports the module on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attribute):
+        # Only called for attributes not set in __init__; import_module is a
+        # sys.modules lookup after the first call
+        return getattr(importlib.import_module(self._name), attribute)
+
+    def __repr__(self):
+        state = 'loaded' if is_loaded(self._name) else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_module(name):
+    return LazyModule(name)
+
+
+def is_loaded(name):
+    """Whether a module has been imported in this process"""
+    return name in sys.modules
@@ -0,0 +1,232 @@
+"""Vectorized re-implementation of the TextBlob/pattern polarity scorer.
+
+TextBlob builds a ``TextBlob`` object per text and walks every token through
+pattern's ``Sentiment.assessments`` state machine in pure Python. This module
+loads the same lexicon once into NumPy arrays and evaluates the same rules
+(intensifiers, negations, "!" boosts, emoticons and the "(!)" irony mark) for
+a whole batch of texts at once.
+
+Tokenization is delegated to pattern's own tokenizer so that both engines see
+identical token streams. Polarity and subjectivity agree with
+``TextBlob(text).sentiment`` to within ``SCORE_TOLERANCE`` (absolute); in
+practice the results are bit-for-bit identical because the arithmetic is
+performed in the same order.
+"""
+import numpy as np
+
+SCORE_TOLERANCE = 1e-9
+
+# Multiplier pattern applies to the previous assessment for each "!".
+EXCLAMATION_BOOST = 1.25
+# "not good" = slightly bad, "not bad" = slightly good.
+NEGATION_FACTOR = -0.5
+
+
+def _clamp(values):
+    return np.minimum(np.maximum(values, -1.0), 1.0)
+
+
+def _last_before(flags, index):
+    """For every position, the index of the last True flag strictly before it (-1 if none)."""
+    marked = np.where(flags, index, -1)
+    last = np.empty_like(marked)
+    if len(marked):
+        last[0] = -1
+        np.maximum.accumulate(marked[:-1], out=last[1:])
+    return last
+
+
+class LexiconSentimentEngine:
+    """Batch polarity/subjectivity scorer backed by the pattern sentiment lexicon."""
+
+    def __init__(self, lexicon=None):
+        from textblob import _text
+        if lexicon is None:
+            from textblob.en import sentiment as lexicon
+        if dict.__len__(lexicon) == 0:
+            lexicon.load()
+
+        words = list(dict.keys(lexicon))
+        entries = [dict.__getitem__(lexicon, w) for w in words]
+        scores = np.array([entry[None] for entry in entries], dtype=np.float64).reshape(-1, 3)
+
+        self.vocabulary = {w: i for i, w in enumerate(words)}
+        self.polarity = scores[:, 0]
+        self.subjectivity = scores[:, 1]
+        self.intensity = scores[:, 2]
+        self.modifier = np.array(
+            [any(tag in entry for tag in lexicon.modifiers) for entry in entries], dtype=bool
+        )
+        self.ly_modifier = np.array([lexicon.modifier(w) for w in words], dtype=bool)
+        self.negation = np.array([w in lexicon.negations for w in words], dtype=bool)
+
+        self._tokenizer = lexicon.tokenizer
+        self._negations = frozenset(lexicon.negations)
+        self._punctuation = _text.PUNCTUATION
+        self._emoticons = {}
+        for (_, score), faces in _text.EMOTICONS.items():
+            for face in faces:
+                self._emoticons.setdefault(face.lower(), score)
+
+    def __len__(self):
+        return len(self.vocabulary)
+
+    def tokenize(self, text):
+        """Lower-cased tokens exactly as pattern's ``Sentiment.__call__`` sees them."""
+        return [w.lower() for w in " ".join(self._tokenizer(text)).split()]
+
+    def _unknown_features(self, token):
+        # (creates assessment, polarity, negation, kills modifier, clears negation, exclamation)
+        is_negation = token in self._negations
+        creates, score = False, 0.0
+        if token == "(!)":
+            creates = True
+        elif token.isalpha() is False and len(token) <= 5 and token not in self._punctuation:
+            if token in self._emoticons:
+                creates, score = True, self._emoticons[token]
+        return (
+            creates,
+            score,
+            is_negation,
+            len(token) > 2,
+            not is_negation and len(token.strip("'")) > 1,
+            token == "!",
+        )
+
+    def _encode(self, texts):
+        """Map texts to a flat array of token codes plus per-text token counts.
+
+        Codes below ``len(self)`` index the lexicon; higher codes index a
+        per-batch table of unknown tokens.
+        """
+        vocabulary = self.vocabulary
+        unknown = {}
+        codes = []
+        lengths = np.empty(len(texts), dtype=np.int64)
+        size = len(vocabulary)
+        for n, text in enumerate(texts):
+            tokens = self.tokenize(text)
+            lengths[n] = len(tokens)
+            for token in tokens:
+                code = vocabulary.get(token)
+                if code is None:
+                    code = unknown.get(token)
+                    if code is None:
+                        code = unknown[token] = size + len(unknown)
+                codes.append(code)
+        features = [self._unknown_features(token) for token in unknown]
+        return np.array(codes, dtype=np.int64), lengths, features
+
+    def _feature_tables(self, features):
+        size = len(self)
+        extra = len(features)
+        if extra:
+            creates, score, negation, kills, clears, bang = (np.array(col) for col in zip(*features))
+        else:
+            creates = negation = kills = clears = bang = np.zeros(0, dtype=bool)
+            score = np.zeros(0, dtype=np.float64)
+        false = np.zeros(size, dtype=bool)
+        # Emoticons and "(!)" are fully subjective with neutral intensity.
+        return {
+            'known': np.concatenate([~false, np.zeros(extra, dtype=bool)]),
+            'polarity': np.concatenate([self.polarity, score.astype(np.float64)]),
+            'subjectivity': np.concatenate([self.subjectivity, np.where(creates, 1.0, 0.0)]),
+            'intensity': np.concatenate([self.intensity, np.ones(extra)]),
+            'modifier': np.concatenate([self.modifier, np.zeros(extra, dtype=bool)]),
+            'ly_modifier': np.concatenate([self.ly_modifier, np.zeros(extra, dtype=bool)]),
+            'negation': np.concatenate([self.negation, negation.astype(bool)]),
+            'creates': np.concatenate([false, creates.astype(bool)]),
+            'kills': np.concatenate([false, kills.astype(bool)]),
+            'clears': np.concatenate([false, clears.astype(bool)]),
+            'bang': np.concatenate([false, bang.astype(bool)]),
+        }
+
+    def score(self, texts):
+        """Return ``(polarity, subjectivity)`` float64 arrays for a sequence of texts."""
+        n_docs = len(texts)
+        codes, lengths, features = self._encode(texts)
+        polarity = np.zeros(n_docs, dtype=np.float64)
+        subjectivity = np.zeros(n_docs, dtype=np.float64)
+        if len(codes) == 0:
+            return polarity, subjectivity
+
+        table = self._feature_tables(features)
+        known = table['known'][codes]
+        negation = table['negation'][codes]
+        index = np.arange(len(codes))
+        doc = np.repeat(np.arange(n_docs), lengths)
+        doc_start = (np.cumsum(lengths) - lengths)[doc]
+
+        # Modifier state: the previous known word in the same text is an
+        # adverb and no long unknown word has been seen since. An "-ly"
+        # modifier survives negations, which are attached to it instead.
+        prev_known = _last_before(known, index)
+        has_prev = prev_known >= doc_start
+        prev_code = codes[np.where(has_prev, prev_known, 0)]
+        prev_ly = table['ly_modifier'][prev_code]
+        kills = ~known & table['kills'][codes]
+        last_kill = np.where(
+            prev_ly,
+            _last_before(kills & ~negation, index),
+            _last_before(kills, index),
+        )
+        modified = has_prev & table['modifier'][prev_code] & (last_kill < prev_known)
+        attached = ~known & negation & modified & prev_ly
+
+        # Negation state: set by a negation word, cleared by any other known
+        # word, by a longer unknown word or by being attached to a modifier.
+        setters = negation & ~attached
+        clearers = (known & ~negation) | table['clears'][codes] | attached
+        last_setter = _last_before(setters, index)
+        negated = known & (last_setter >= doc_start) & (last_setter > _last_before(clearers, index))
+
+        merges = known & modified
+        creates = (known & ~merges) | table['creates'][codes]
+        created = np.cumsum(creates)
+        assessment = created - 1
+        # "!" and attached negations need a preceding assessment in the same text.
+        in_assessment = created > (created - creates)[doc_start]
+
+        # Every known word and every emoticon either starts or updates the
+        # last assessment; only the last such event sets its final scores.
+        events = np.flatnonzero(known | creates)
+        if len(events) == 0:
+            # No lexicon word or emoticon anywhere in the batch
+            return polarity, subjectivity
+        event_codes = codes[events]
+        event_intensity = table['intensity'][event_codes]
+        event_intensity = np.where(negated[events], 1.0 / event_intensity, event_intensity)
+        prior_intensity = np.empty_like(event_intensity)
+        prior_intensity[0] = 1.0
+        prior_intensity[1:] = event_intensity[:-1]
+        event_merges = merges[events]
+        event_polarity = table['polarity'][event_codes]
+        event_subjectivity = table['subjectivity'][event_codes]
+        event_polarity = np.where(event_merges, _clamp(event_polarity * prior_intensity), event_polarity)
+        event_subjectivity = np.where(
+            event_merges, _clamp(event_subjectivity * prior_intensity), event_subjectivity
+        )
+
+        event_assessment = assessment[events]
+        last = np.flatnonzero(np.append(event_assessment[1:] != event_assessment[:-1], True))
+        n_assessments = len(last)
+        scores_p = event_polarity[last]
+        scores_s = event_subjectivity[last]
+        last_event = events[last]
+
+        bang = ~known & table['bang'][codes] & in_assessment
+        bang &= index > last_event[np.maximum(assessment, 0)]
+        boosts = np.bincount(assessment[bang], minlength=n_assessments)
+        for step in range(boosts.max() if n_assessments else 0):
+            boosted = boosts > step
+            scores_p[boosted] = _clamp(scores_p[boosted] * EXCLAMATION_BOOST)
+
+        flipped = np.zeros(n_assessments, dtype=bool)
+        flipped[assessment[negated | (attached & in_assessment)]] = True
+        scores_p = np.where(flipped, scores_p * NEGATION_FACTOR, scores_p)
+
+        assessment_doc = doc[index[creates]]
+        counts = np.bincount(assessment_doc, minlength=n_docs)
+        polarity = np.bincount(assessment_doc, weights=scores_p, minlength=n_docs) / np.maximum(counts, 1)
+        subjectivity = np.bincount(assessment_doc, weights=scores_s, minlength=n_docs) / np.maximum(counts, 1)
+        return polarity, subjectivity
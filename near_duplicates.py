@@ -0,0 +1,153 @@
+"""Near-duplicate clustering with MinHash and locality-sensitive hashing.
+
+Social feeds repeat the same text with small edits (a different @handle,
+a shortened URL, an extra hashtag). ``NearDuplicateIndex`` turns every text
+into a set of word shingles, summarizes the set with a MinHash signature
+and files the signature of each cluster's representative under one hash
+per LSH band. A new text is only compared with the representatives that
+share at least one band with it, so the cost per text does not grow with
+the number of texts already indexed. Texts whose estimated Jaccard
+similarity to a representative reaches the threshold join its cluster;
+the others start a new cluster.
+"""
+import re
+import threading
+import zlib
+
+import numpy as np
+
+# Largest prime below 2**32: (a * x + b) stays below 2**64 for 32-bit a, x, b
+_PRIME = np.uint64(4294967291)
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _optimal_bands(threshold, num_perm):
+    """(bands, rows) whose LSH S-curve best separates pairs around threshold.
+
+    Minimizes the false positive plus false negative probability mass, as
+    in the usual MinHash LSH parameter choice.
+    """
+    similarity = np.linspace(0.0, 1.0, 201)
+    best = None
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        candidate = 1 - (1 - similarity ** rows) ** bands
+        # Mean over a uniform grid on [0, 1] approximates the integrals
+        false_positive = np.where(similarity < threshold, candidate, 0).mean()
+        false_negative = np.where(similarity >= threshold, 1 - candidate, 0).mean()
+        error = false_positive + false_negative
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+def shingles(text, size=2):
+    """Lower-cased word n-grams of a text; short texts fall back to smaller n-grams"""
+    tokens = _TOKEN_PATTERN.findall(str(text).lower())
+    if not tokens:
+        # Punctuation-only texts (e.g. emoticons) are their own single shingle
+        return [str(text).strip()]
+    size = min(size, len(tokens))
+    return [' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+
+
+class NearDuplicateIndex:
+    """Incremental MinHash LSH index assigning texts to near-duplicate clusters.
+
+    threshold is the Jaccard similarity of the shingle sets above which two
+    texts are near-duplicates. With representatives_only, callers analyze
+    one text per cluster and copy its results to the other members;
+    otherwise every text is analyzed and only the cluster ids are used.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, shingle_size=2, representatives_only=True, seed=1):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.representatives_only = representatives_only
+        self.bands, self.rows = _optimal_bands(threshold, num_perm)
+        generator = np.random.default_rng(seed)
+        self._a = generator.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = generator.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+        self._buckets = [{} for _ in range(self.bands)]
+        self._representatives = []
+        self._signatures = []
+        self._sizes = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._representatives)
+
+    def representative(self, cluster_id):
+        return self._representatives[cluster_id]
+
+    def signatures(self, texts):
+        """(len(texts), num_perm) uint32 MinHash signatures, computed one permutation at a time over all shingles"""
+        hashes = []
+        lengths = np.empty(len(texts), dtype=np.int64)
+        for i, text in enumerate(texts):
+            text_shingles = set(shingles(text, self.shingle_size))
+            lengths[i] = len(text_shingles)
+            hashes.extend(zlib.crc32(shingle.encode('utf-8')) for shingle in text_shingles)
+        signatures = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        if not len(texts):
+            return signatures
+        hashes = np.array(hashes, dtype=np.uint64)
+        starts = np.cumsum(lengths) - lengths
+        for permutation in range(self.num_perm):
+            permuted = (self._a[permutation] * hashes + self._b[permutation]) % _PRIME
+            signatures[:, permutation] = np.minimum.reduceat(permuted, starts)
+        return signatures
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [signature[band * rows:(band + 1) * rows].tobytes() for band in range(self.bands)]
+
+    def assign(self, texts):
+        """Cluster texts against the index, adding new clusters as needed.
+
+        Returns (cluster_ids, representatives): an int64 array with one
+        cluster id per text and the representative text of each one's
+        cluster (the first text that started it, possibly from an earlier
+        batch).
+        """
+        signatures = self.signatures(texts)
+        cluster_ids = np.empty(len(texts), dtype=np.int64)
+        with self._lock:
+            for i, (text, signature) in enumerate(zip(texts, signatures)):
+                keys = self._band_keys(signature)
+                candidates = set()
+                for bucket, key in zip(self._buckets, keys):
+                    candidates.update(bucket.get(key, ()))
+                cluster_id = None
+                best = self.threshold
+                for candidate in candidates:
+                    similarity = np.count_nonzero(self._signatures[candidate] == signature) / self.num_perm
+                    if similarity >= best:
+                        cluster_id, best = candidate, similarity
+                if cluster_id is None:
+                    cluster_id = len(self._representatives)
+                    self._representatives.append(text)
+                    self._signatures.append(signature)
+                    self._sizes.append(0)
+                    for bucket, key in zip(self._buckets, keys):
+                        bucket.setdefault(key, []).append(cluster_id)
+                self._sizes[cluster_id] += 1
+                cluster_ids[i] = cluster_id
+            representatives = [self._representatives[cluster_id] for cluster_id in cluster_ids]
+        return cluster_ids, representatives
+
+    def stats(self):
+        with self._lock:
+            texts = sum(self._sizes)
+            return {
+                'texts': texts,
+                'clusters': len(self._representatives),
+                'near_duplicate_ratio': 1 - len(self._representatives) / texts if texts else 0.0,
+                'threshold': self.threshold,
+                'bands': self.bands,
+                'rows': self.rows,
+            }
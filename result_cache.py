@@ -0,0 +1,184 @@
+"""Content-addressed cache for per-text analysis results.
+
+Entries are keyed by a hash of the analyzer version, the kind of result
+(sentiment scores, keywords, ...) and the normalized text, so repeated texts
+skip all NLP work. The in-memory tier is an LRU bounded by an approximate
+byte budget; the optional SQLite tier persists entries across runs and is
+shared by every process that points at the same file.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Set to a file path to enable the on-disk tier for the default cache
+CACHE_PATH_ENV = 'SENTIMENT_CACHE_PATH'
+
+
+def normalize_text(text):
+    # Only surrounding whitespace is dropped: it never changes tokenization,
+    # while case and inner whitespace can (abbreviations, paragraph breaks).
+    return str(text).strip()
+
+
+def make_key(text, kind, version):
+    """Return the cache key for a text and result kind under an analyzer version"""
+    payload = f"{version}\0{kind}\0{normalize_text(text)}".encode('utf-8', 'surrogatepass')
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _approx_size(value):
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_approx_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """Two-tier (memory LRU + optional SQLite) cache for JSON-serializable values"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, path=None):
+        self.max_bytes = max_bytes
+        self.path = path
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._connection = None
+        self._connection_pid = None
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    def _db(self):
+        # SQLite connections must not cross a fork, so reconnect per process
+        if self.path is None:
+            return None
+        if self._connection is None or self._connection_pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+            connection.commit()
+            self._connection = connection
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def _remember(self, key, value):
+        size = _approx_size(key) + _approx_size(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= self._sizes[key]
+            self._entries.move_to_end(key)
+        self._entries[key] = value
+        self._sizes[key] = size
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            old_key, _ = self._entries.popitem(last=False)
+            self._bytes -= self._sizes.pop(old_key)
+            self.evictions += 1
+
+    def get_many(self, keys):
+        """Return {key: value} for every key found in either tier"""
+        found = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+                    self.memory_hits += 1
+                elif key not in found:
+                    missing.append(key)
+            db = self._db()
+            if db is not None and missing:
+                unique = list(dict.fromkeys(missing))
+                # Stay well below SQLite's bound-parameter limit
+                for start in range(0, len(unique), 500):
+                    batch = unique[start:start + 500]
+                    rows = db.execute(
+                        f"SELECT key, value FROM results WHERE key IN ({','.join('?' * len(batch))})",
+                        batch
+                    ).fetchall()
+                    for key, raw in rows:
+                        value = json.loads(raw)
+                        found[key] = value
+                        self._remember(key, value)
+                self.disk_hits += sum(1 for key in missing if key in found)
+            hits = sum(1 for key in keys if key in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return found
+
+    def get(self, key, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def set_many(self, items):
+        """Store an iterable of (key, value) pairs in both tiers"""
+        items = list(items)
+        with self._lock:
+            for key, value in items:
+                self._remember(key, value)
+            db = self._db()
+            if db is not None and items:
+                db.executemany(
+                    'INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)',
+                    [(key, json.dumps(value)) for key, value in items]
+                )
+                db.commit()
+
+    def set(self, key, value):
+        self.set_many([(key, value)])
+
+    def clear(self, disk=False):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            db = self._db()
+            if disk and db is not None:
+                db.execute('DELETE FROM results')
+                db.commit()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'memory_bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'path': self.path,
+            }
+
+
+_default_cache = None
+
+
+def get_result_cache():
+    """Return the process-wide cache, creating it from the environment on first use"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache(path=os.environ.get(CACHE_PATH_ENV) or None)
+    return _default_cache
+
+
+def configure_result_cache(max_bytes=DEFAULT_MAX_BYTES, path=None):
+    """Replace the process-wide cache, e.g. to enable the SQLite tier"""
+    global _default_cache
+    _default_cache = ResultCache(max_bytes=max_bytes, path=path)
+    return _default_cache
@@ -0,0 +1,219 @@
+"""Append-only store for analysis results.
+
+The dashboard used to ``pd.concat`` every new batch onto the full history,
+copying all previous rows on each append. ``ResultsStore`` instead keeps a
+list of immutable result chunks, so appending is proportional to the new
+chunk only, and concatenates them lazily the first time a single frame is
+needed. Every mutation bumps ``version``, a cheap key for caches that derive
+data from the results. Chunks are stored in the compact schema of
+``compact_results``.
+"""
+import numpy as np
+import pandas as pd
+
+from compact_results import compact_results, concat_results
+
+FILTER_COLUMNS = ('sentiment', 'source')
+
+
+class FilterIndex:
+    """Categorical codes of the filterable columns of one results frame.
+
+    A filter on a column is a lookup table over that column's categories
+    indexed by the precomputed codes, which yields the row mask without
+    comparing any strings. Sources can be unique per row (e.g. "Batch
+    Input 17"), so per-value bitmaps would cost O(rows x values); the
+    lookup table costs O(rows) per filtered column.
+    """
+
+    def __init__(self, frame, columns=FILTER_COLUMNS):
+        self.frame = frame
+        self._codes = {}
+        self._categories = {}
+        for column in columns:
+            if column in frame.columns:
+                codes, categories = pd.factorize(frame[column])
+                # Missing values get code -1, which hits the trailing False in
+                # mask(): they are only dropped once the column is narrowed
+                self._codes[column] = codes
+                self._categories[column] = categories
+        self._last = None
+
+    def values(self, column):
+        """Distinct non-missing values of an indexed column, in first-seen order"""
+        if column not in self._categories:
+            return []
+        return list(self._categories[column])
+
+    def _allowed(self, column, values):
+        # Per-category lookup table, or None if every category is selected
+        allowed = self._categories[column].isin(list(values))
+        return None if allowed.all() else allowed
+
+    def mask(self, column, values):
+        """Boolean row mask for rows whose column is one of values, or None if every row matches"""
+        allowed = self._allowed(column, values)
+        if allowed is None:
+            return None
+        return np.append(allowed, False)[self._codes[column]]
+
+    def apply(self, selections):
+        """Filter the frame by {column: selected values}; None means no filter on that column.
+
+        Returns (frame, key) where key identifies the effective filter. The
+        unfiltered frame is returned as-is, and the last filtered result is
+        reused while the selection stays the same without touching the rows.
+        """
+        tables = []
+        key = []
+        for column, values in selections.items():
+            if values is None or column not in self._codes:
+                continue
+            allowed = self._allowed(column, values)
+            if allowed is None:
+                continue
+            tables.append((column, allowed))
+            key.append((column, tuple(sorted(map(str, values)))))
+        key = tuple(key)
+        if not tables:
+            return self.frame, key
+        if self._last is None or self._last[0] != key:
+            mask = None
+            for column, allowed in tables:
+                column_mask = np.append(allowed, False)[self._codes[column]]
+                mask = column_mask if mask is None else np.logical_and(mask, column_mask, out=mask)
+            self._last = (key, self.frame[mask])
+        return self._last[1], key
+
+
+def _categorical_order(values, ascending):
+    """Stable argsort of a categorical by value, missing values last.
+
+    sort_values orders categoricals by category position, which after
+    concat_results is first-seen order rather than the values' order.
+    """
+    categories = values.cat.categories.to_numpy()
+    rank = np.argsort(np.argsort(categories, kind='stable'), kind='stable')
+    codes = values.cat.codes.to_numpy()
+    keys = rank[codes] if ascending else -rank[codes]
+    keys = np.where(codes < 0, np.iinfo(np.int64).max, keys)
+    return np.argsort(keys, kind='stable')
+
+
+class ResultsStore:
+    """List of immutable result DataFrame chunks with a version counter"""
+
+    def __init__(self):
+        self._chunks = []
+        self._length = 0
+        self._version = 0
+        self._filter_index = None
+        self._orders = {}
+        self._filtered_order = None
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def empty(self):
+        return self._length == 0
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def chunks(self):
+        return tuple(self._chunks)
+
+    @property
+    def columns(self):
+        columns = []
+        for chunk in self._chunks:
+            columns.extend(column for column in chunk.columns if column not in columns)
+        return columns
+
+    def append(self, frame):
+        """Add a results frame, stored compacted; derived columns such as explanation are dropped"""
+        if frame is None or frame.empty:
+            return self._version
+        self._chunks.append(compact_results(frame))
+        self._length += len(frame)
+        self._version += 1
+        return self._version
+
+    def clear(self):
+        self._chunks = []
+        self._length = 0
+        self._version += 1
+        return self._version
+
+    def unique(self, column):
+        """Distinct values of a column across all chunks, in first-seen order"""
+        values = [chunk[column] for chunk in self._chunks if column in chunk.columns]
+        if not values:
+            return []
+        return pd.unique(pd.concat([pd.Series(series.unique()) for series in values], ignore_index=True))
+
+    def to_frame(self):
+        """Return all results as one frame, compacting the chunks on first use.
+
+        Compaction does not change the version: the data is the same. The
+        returned frame is shared and must be treated as read-only.
+        """
+        if not self._chunks:
+            return pd.DataFrame()
+        first = self._chunks[0]
+        if len(self._chunks) > 1 or not first.index.equals(pd.RangeIndex(len(first))):
+            self._chunks = [concat_results(self._chunks)]
+        return self._chunks[0]
+
+    def filter_index(self):
+        """FilterIndex over the compacted frame, rebuilt only when the version changes"""
+        if self._filter_index is None or self._filter_index[0] != self._version:
+            self._filter_index = (self._version, FilterIndex(self.to_frame()))
+        return self._filter_index[1]
+
+    def filtered(self, selections):
+        """Shortcut for filter_index().apply(selections)"""
+        return self.filter_index().apply(selections)
+
+    def sort_order(self, column, ascending=True):
+        """Row positions of the compacted frame sorted by column (stable, missing values last).
+
+        Argsort indexes are computed once per column and direction and
+        dropped whenever the version changes.
+        """
+        if self._orders.get('version') != self._version:
+            self._orders = {'version': self._version}
+        if (column, ascending) not in self._orders:
+            values = self.to_frame()[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                self._orders[(column, ascending)] = values.index.to_numpy()[_categorical_order(values, ascending)]
+            else:
+                ordered = values.sort_values(ascending=ascending, kind='stable', na_position='last')
+                self._orders[(column, ascending)] = ordered.index.to_numpy()
+        return self._orders[(column, ascending)]
+
+    def page(self, selections, start, stop, sort_by=None, ascending=True):
+        """Rows start:stop of the filtered results, optionally sorted by a column.
+
+        Only the rows of the page are gathered; the sorted order of the
+        filtered rows is derived from the column's argsort index and reused
+        while the version, filter and sort stay the same.
+        """
+        frame, key = self.filtered(selections)
+        if sort_by is None:
+            return frame.iloc[start:stop]
+        order = self.sort_order(sort_by, ascending)
+        cache_key = (self._version, key, sort_by, ascending)
+        if self._filtered_order is None or self._filtered_order[0] != cache_key:
+            if len(frame) == self._length:
+                positions = order
+            else:
+                # Filtered frames keep the compacted frame's positions as index
+                keep = np.zeros(self._length, dtype=bool)
+                keep[frame.index.to_numpy()] = True
+                positions = order[keep[order]]
+            self._filtered_order = (cache_key, positions)
+        return self.to_frame().take(self._filtered_order[1][start:stop])
@@ -1,31 +1,89 @@
-
 import pandas as pd
-from textblob import TextBlob
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from collections import Counter
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
 import re
-import nltk
 import os
+import numpy as np
+from scipy.sparse import csr_matrix
+from importlib.metadata import version, PackageNotFoundError
+from analyzer_resources import get_analyzer_resources
+from result_cache import get_result_cache, make_key, normalize_text
 
-# Ensure NLTK data is available
-nltk_data_path = os.path.join(os.path.dirname(__file__), 'nltk_data')
-if os.path.exists(nltk_data_path):
-    nltk.data.path.append(nltk_data_path)
+SENTIMENT_ENGINES = ('lexicon', 'textblob')
 
-def analyze_sentiment_textblob(text):
-    analysis = TextBlob(text)
-    # Polarity ranges from -1.0 (negative) to 1.0 (positive)
-    # Subjectivity ranges from 0.0 (objective) to 1.0 (subjective)
-    polarity = analysis.sentiment.polarity
-    subjectivity = analysis.sentiment.subjectivity
+KEYWORD_WEIGHTINGS = ('count', 'tfidf')
+
+SENTIMENT_LABELS = ('Positive', 'Negative', 'Neutral')
+SENTIMENT_DTYPE = pd.CategoricalDtype(SENTIMENT_LABELS)
+
+# Column order of every results frame
+RESULT_COLUMNS = ['text', 'sentiment', 'confidence', 'polarity', 'subjectivity', 'keywords', 'source', 'date']
+
+# Part of every result cache key: bump it whenever scoring or keyword
+# extraction changes so stale cached results are never served
+try:
+    ANALYZER_VERSION = f"1/textblob-{version('textblob')}"
+except PackageNotFoundError:
+    ANALYZER_VERSION = "1/textblob-unknown"
+
+# Upper bound on texts per worker task in parallel mode
+DEFAULT_CHUNK_SIZE = 5000
 
+
+# Explanation wording per sentiment: the part between the quoted text and the
+# polarity score, and the part after the score
+EXPLANATION_TEMPLATES = {
+    'Positive': ("' is classified as Positive due to words and phrases indicating approval or satisfaction. The polarity score is ", "."),
+    'Negative': ("' is classified as Negative due to words and phrases indicating disapproval or dissatisfaction. The polarity score is ", "."),
+    'Neutral': ("' is classified as Neutral. The polarity score is ", ". This could be due to a lack of strong emotional language or a balance of positive and negative terms."),
+}
+
+def get_lexicon_engine():
+    # The lexicon is parsed once per process and shared by every batch
+    return get_analyzer_resources().lexicon_engine
+
+def classify_polarity(polarity):
     if polarity > 0:
-        sentiment = 'Positive'
+        return 'Positive'
     elif polarity < 0:
-        sentiment = 'Negative'
+        return 'Negative'
     else:
-        sentiment = 'Neutral'
+        return 'Neutral'
+
+def _cached_batch(texts, kind, compute):
+    """Look texts up in the result cache and compute only the misses.
+
+    compute receives the list of distinct missing texts and returns one
+    JSON-serializable value per text. The values are the cache's own
+    objects, shared by every caller in the process: copy them before
+    handing them out.
+    """
+    cache = get_result_cache()
+    keys = [make_key(text, kind, ANALYZER_VERSION) for text in texts]
+    found = cache.get_many(keys)
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in missing:
+            missing[key] = text
+    if missing:
+        computed = list(zip(missing, compute(list(missing.values()))))
+        cache.set_many(computed)
+        found.update(computed)
+    return [found[key] for key in keys]
+
+def _textblob_scores(texts):
+    # Same as TextBlob(text).sentiment without building a TextBlob per text
+    analyze = get_analyzer_resources().textblob_analyzer.analyze
+    scores = [analyze(text) for text in texts]
+    return [[score.polarity, score.subjectivity] for score in scores]
+
+def analyze_sentiment_textblob(text):
+    # Polarity ranges from -1.0 (negative) to 1.0 (positive)
+    # Subjectivity ranges from 0.0 (objective) to 1.0 (subjective)
+    polarity, subjectivity = _cached_batch([text], 'sentiment', _textblob_scores)[0]
+
+    sentiment = classify_polarity(polarity)
     
     # Confidence score can be derived from the absolute polarity
     # Higher absolute polarity means higher confidence
@@ -33,21 +91,38 @@ def analyze_sentiment_textblob(text):
 
     return sentiment, confidence, polarity, subjectivity
 
+def score_texts(texts, engine='lexicon'):
+    """Return (polarities, subjectivities) lists for a list of raw texts"""
+    scores = _score_matrix(texts, engine)
+    return scores[:, 0].tolist(), scores[:, 1].tolist()
+
+def _score_matrix(texts, engine):
+    # (n, 2) float64 array of polarity and subjectivity per text
+    if engine == 'lexicon':
+        def compute(missing):
+            polarities, subjectivities = get_lexicon_engine().score(missing)
+            return [[p, s] for p, s in zip(polarities.tolist(), subjectivities.tolist())]
+    elif engine == 'textblob':
+        compute = _textblob_scores
+    else:
+        raise ValueError(f"Unknown sentiment engine '{engine}', expected one of {SENTIMENT_ENGINES}")
+    # Both engines produce the same scores, so they share cache entries
+    scores = _cached_batch(texts, 'sentiment', compute)
+    return np.array(scores, dtype=np.float64).reshape(len(texts), 2)
+
+def get_stop_words():
+    return get_analyzer_resources().stop_words
+
+def get_word_tokenizer():
+    return get_analyzer_resources().word_tokenizer
+
 def extract_keywords(text, num_keywords=5):
-    try:
-        stop_words = set(stopwords.words('english'))
-    except LookupError:
-        # Fallback to basic stop words if NLTK data is not available
-        stop_words = set(['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'])
-    
-    try:
-        word_tokens = word_tokenize(text.lower())
-    except LookupError:
-        # Fallback to simple split if NLTK tokenizer is not available
-        word_tokens = text.lower().split()
-    
+    keywords = _cached_batch([text], f'keywords:{num_keywords}', lambda missing: [_extract_keywords(missing[0], num_keywords)])[0]
+    return list(keywords)
+
+def _extract_keywords(text, num_keywords=5):
     # Filter out stop words and non-alphabetic tokens
-    filtered_words = [word for word in word_tokens if word.isalpha() and word not in stop_words]
+    filtered_words = _keyword_tokens(text)
     
     # Count word frequencies
     word_counts = Counter(filtered_words)
@@ -57,31 +132,295 @@ def extract_keywords(text, num_keywords=5):
     
     return [word for word, count in most_common]
 
-def batch_analyze_sentiment(texts):
-    results = []
-    for text_item in texts:
-        sentiment, confidence, polarity, subjectivity = analyze_sentiment_textblob(text_item['text'])
-        keywords = extract_keywords(text_item['text'])
-        results.append({
-            'text': text_item['text'],
-            'sentiment': sentiment,
-            'confidence': confidence,
-            'polarity': polarity,
-            'subjectivity': subjectivity,
-            'keywords': keywords,
-            'source': text_item.get('source', 'N/A'),
-            'date': text_item.get('date', 'N/A')
-        })
-    return pd.DataFrame(results)
+def _keyword_tokens(text):
+    stop_words = get_stop_words()
+    return [word for word in get_word_tokenizer()(text.lower()) if word.isalpha() and word not in stop_words]
 
-def get_sentiment_explanation(text, sentiment, polarity):
-    if sentiment == 'Positive':
-        return f"The text '{text}' is classified as Positive due to words and phrases indicating approval or satisfaction. The polarity score is {polarity:.2f}."
-    elif sentiment == 'Negative':
-        return f"The text '{text}' is classified as Negative due to words and phrases indicating disapproval or dissatisfaction. The polarity score is {polarity:.2f}."
+def build_term_matrix(texts):
+    """Tokenize texts into a sparse document-term count matrix.
+
+    Returns (matrix, terms, first_seen) where terms maps column ids to words
+    and first_seen holds, aligned with matrix.data, the token position at
+    which each term first appeared in its document.
+    """
+    vocabulary = {}
+    term_ids = []
+    lengths = np.empty(len(texts), dtype=np.int64)
+    for n, text in enumerate(texts):
+        tokens = _keyword_tokens(text)
+        lengths[n] = len(tokens)
+        term_ids.extend(vocabulary.setdefault(token, len(vocabulary)) for token in tokens)
+    
+    columns = np.array(term_ids, dtype=np.int64)
+    rows = np.repeat(np.arange(len(texts)), lengths)
+    matrix = csr_matrix(
+        (np.ones(len(columns), dtype=np.int64), (rows, columns)),
+        shape=(len(texts), len(vocabulary))
+    )
+    matrix.sum_duplicates()
+    # sum_duplicates leaves entries ordered by (row, column), which is also
+    # the order np.unique returns the flattened (row, column) pairs in
+    _, first_seen = np.unique(rows * max(len(vocabulary), 1) + columns, return_index=True)
+    terms = np.array(list(vocabulary), dtype=object)
+    return matrix, terms, first_seen
+
+def extract_keywords_corpus(texts, num_keywords=5, weighting='count'):
+    """Return the top keywords of every text in one vectorized pass.
+
+    weighting='count' ranks by raw term frequency and matches extract_keywords
+    exactly (ties go to the earlier term); 'tfidf' ranks by TF-IDF weight
+    across the given corpus.
+    """
+    if weighting not in KEYWORD_WEIGHTINGS:
+        raise ValueError(f"Unknown keyword weighting '{weighting}', expected one of {KEYWORD_WEIGHTINGS}")
+    matrix, terms, first_seen = build_term_matrix(texts)
+    if matrix.nnz == 0:
+        return [[] for _ in texts]
+    
+    if weighting == 'tfidf':
+        # scikit-learn takes longer to import than most batches take to score
+        from sklearn.feature_extraction.text import TfidfTransformer
+        weights = TfidfTransformer().fit_transform(matrix).tocsr()
+        weights.sort_indices()
+        scores = weights.data
     else:
-        return f"The text '{text}' is classified as Neutral. The polarity score is {polarity:.2f}. This could be due to a lack of strong emotional language or a balance of positive and negative terms."
+        scores = matrix.data
+    
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    order = np.lexsort((first_seen, -scores, rows))
+    # Rank of each entry within its document once sorted by score
+    rank = np.arange(len(order)) - matrix.indptr[rows[order]]
+    top = order[rank < num_keywords]
+    counts = np.bincount(rows[top], minlength=matrix.shape[0])
+    words = terms[matrix.indices[top]].tolist()
+    
+    keywords = []
+    start = 0
+    for count in counts.tolist():
+        keywords.append(words[start:start + count])
+        start += count
+    return keywords
+
+def _init_worker(engine):
+    # Load the NLP resources once per worker process rather than once per chunk
+    get_analyzer_resources().warm_up(engine)
+
+def _text_columns(texts):
+    count = len(texts)
+    raw_texts = np.empty(count, dtype=object)
+    sources = np.empty(count, dtype=object)
+    dates = np.empty(count, dtype=object)
+    for i, text_item in enumerate(texts):
+        raw_texts[i] = text_item['text']
+        sources[i] = text_item.get('source', 'N/A')
+        dates[i] = text_item.get('date', 'N/A')
+    return raw_texts, sources, dates
+
+def _deduplicate(raw_texts, dedup=True):
+    """Return (codes, unique texts) so that unique_texts[codes[i]] is row i's normalized text.
+
+    Texts equal after normalize_text (the result cache's key normalization)
+    are analyzed once.
+    """
+    normalized = [normalize_text(text) for text in raw_texts]
+    if not dedup:
+        return np.arange(len(normalized)), normalized
+    codes, uniques = pd.factorize(pd.Series(normalized, dtype=object))
+    return codes, list(uniques)
+
+def _analyze_unique(texts, engine):
+    # (n, 2) float64 scores and an object array of keyword lists for plain texts.
+    # The lexicon engine scores the whole batch at once and matches
+    # TextBlob's polarity/subjectivity (see lexicon_engine.SCORE_TOLERANCE)
+    scores = _score_matrix(texts, engine)
+    keywords = np.empty(len(texts), dtype=object)
+    keywords[:] = _cached_batch(texts, 'keywords:5', extract_keywords_corpus)
+    return scores, keywords
+
+def _results_frame(raw_texts, sources, dates, scores, keywords, unique_count, cluster_ids=None, analyzed_count=None):
+    # Results are written straight into typed columns instead of one dict
+    # per row: float32 scores, categorical sentiment and source
+    count = len(raw_texts)
+    polarity = np.empty(count, dtype=np.float32)
+    subjectivity = np.empty(count, dtype=np.float32)
+    confidence = np.empty(count, dtype=np.float32)
+    polarity[:] = scores[:, 0]
+    subjectivity[:] = scores[:, 1]
+    np.abs(polarity, out=confidence)
+    
+    # Classify on the float64 scores so tiny polarities keep their sign
+    sentiment_codes = np.full(count, SENTIMENT_LABELS.index('Neutral'), dtype=np.int8)
+    sentiment_codes[scores[:, 0] > 0] = SENTIMENT_LABELS.index('Positive')
+    sentiment_codes[scores[:, 0] < 0] = SENTIMENT_LABELS.index('Negative')
+    
+    results = pd.DataFrame({
+        'text': raw_texts,
+        'sentiment': pd.Categorical.from_codes(sentiment_codes, dtype=SENTIMENT_DTYPE),
+        'confidence': confidence,
+        'polarity': polarity,
+        'subjectivity': subjectivity,
+        'keywords': keywords,
+        'source': pd.Categorical(sources),
+        'date': dates
+    }, columns=RESULT_COLUMNS)
+    results.attrs['dedup'] = dedup_stats(count, unique_count)
+    if cluster_ids is not None:
+        results['cluster_id'] = cluster_ids
+        results.attrs['near_duplicates'] = {
+            'clusters': len(np.unique(cluster_ids)),
+            'analyzed_texts': analyzed_count,
+        }
+    return results
+
+def dedup_stats(rows, unique_texts):
+    """Savings of the dedup stage: rows analyzed vs distinct texts actually scored"""
+    return {
+        'rows': rows,
+        'unique_texts': unique_texts,
+        'dedup_ratio': 1 - unique_texts / rows if rows else 0.0,
+    }
+
+def _plan(texts, dedup, near_duplicates):
+    """Split text dicts into per-row columns and the distinct texts to analyze.
 
+    Returns (raw_texts, sources, dates, codes, analyzed_texts, unique_count,
+    cluster_ids) where analyzed_texts[codes[i]] is the text whose results
+    row i gets. Runs in the calling process: the near-duplicate index is
+    shared state.
+    """
+    raw_texts, sources, dates = _text_columns(texts)
+    codes, analyzed_texts = _deduplicate(raw_texts, dedup)
+    unique_count = len(analyzed_texts)
+    cluster_ids = None
+    if near_duplicates is not None:
+        unique_clusters, representatives = near_duplicates.assign(analyzed_texts)
+        cluster_ids = unique_clusters[codes]
+        if near_duplicates.representatives_only:
+            # Analyze one text per cluster and copy its results to the members
+            representative_codes, analyzed_texts = _deduplicate(representatives)
+            codes = representative_codes[codes]
+    return raw_texts, sources, dates, codes, analyzed_texts, unique_count, cluster_ids
 
+def _assemble(plan, scores, keywords):
+    raw_texts, sources, dates, codes, analyzed_texts, unique_count, cluster_ids = plan
+    # Fan the per-text results back out to every row; text, source and
+    # date stay per row. Each row gets its own keyword list so editing one
+    # row changes neither its duplicates nor the shared result cache
+    row_keywords = np.empty(len(codes), dtype=object)
+    row_keywords[:] = [list(words) for words in keywords[codes]]
+    return _results_frame(
+        raw_texts, sources, dates, scores[codes], row_keywords, unique_count, cluster_ids, len(analyzed_texts)
+    )
+
+def _analyze_chunk(texts, engine, dedup=True, near_duplicates=None):
+    plan = _plan(texts, dedup, near_duplicates)
+    return _assemble(plan, *_analyze_unique(plan[4], engine))
+
+def batch_analyze_sentiment(texts, engine='lexicon', workers=1, chunk_size=None, dedup=True, near_duplicates=None):
+    """Analyze a list of {'text', 'source', 'date'} dicts into a results DataFrame.
+
+    With dedup (the default) texts that are equal after stripping
+    surrounding whitespace are analyzed once and their results copied to
+    every row; ``results.attrs['dedup']`` holds the row and unique-text
+    counts and the dedup ratio. near_duplicates is an optional
+    near_duplicates.NearDuplicateIndex: rows then get a ``cluster_id``
+    column and, if the index is set to, share the results of their
+    cluster's representative. With workers > 1 (or None for one per CPU)
+    the texts to analyze are split into chunks that are scored in a
+    process pool; rows keep their original order.
+    """
+    if engine not in SENTIMENT_ENGINES:
+        raise ValueError(f"Unknown sentiment engine '{engine}', expected one of {SENTIMENT_ENGINES}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    plan = _plan(texts, dedup, near_duplicates)
+    analyzed_texts = plan[4]
+    if workers <= 1 or len(analyzed_texts) <= 1:
+        return _assemble(plan, *_analyze_unique(analyzed_texts, engine))
+    
+    if chunk_size is None:
+        # A few chunks per worker keeps the pool balanced without tiny tasks
+        chunk_size = min(DEFAULT_CHUNK_SIZE, -(-len(analyzed_texts) // (workers * 4)))
+    chunks = [analyzed_texts[i:i + chunk_size] for i in range(0, len(analyzed_texts), chunk_size)]
+    workers = min(workers, len(chunks))
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(engine,)) as executor:
+        parts = list(executor.map(_analyze_unique, chunks, repeat(engine)))
+    scores = np.concatenate([part[0] for part in parts])
+    keywords = np.concatenate([part[1] for part in parts])
+    return _assemble(plan, scores, keywords)
+
+def iter_chunks(iterable, chunk_size):
+    """Yield lists of up to chunk_size items from any iterable"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def _as_text_item(item):
+    return item if isinstance(item, dict) else {'text': item}
+
+def iter_analyze(texts, chunk_size=DEFAULT_CHUNK_SIZE, engine='lexicon', workers=1, dedup=True, near_duplicates=None):
+    """Analyze an iterable of texts (strings or text dicts) lazily.
+
+    Yields one results DataFrame per chunk_size inputs as they arrive, with
+    a running row index, so memory stays bounded by the chunk size however
+    long the input is. With workers > 1 at most two chunks per worker are
+    in flight at once. Duplicates are removed within each chunk;
+    near_duplicates clusters across all chunks (see batch_analyze_sentiment).
+    """
+    if engine not in SENTIMENT_ENGINES:
+        raise ValueError(f"Unknown sentiment engine '{engine}', expected one of {SENTIMENT_ENGINES}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = ([_as_text_item(item) for item in chunk] for chunk in iter_chunks(texts, chunk_size))
+    
+    offset = 0
+    for results in _analyze_stream(chunks, engine, workers, dedup, near_duplicates):
+        results.index += offset
+        offset += len(results)
+        yield results
+
+def _analyze_stream(chunks, engine, workers, dedup, near_duplicates):
+    if workers <= 1:
+        for chunk in chunks:
+            yield _analyze_chunk(chunk, engine, dedup, near_duplicates)
+        return
+    
+    # Chunks are planned (deduplicated, clustered) here and only the texts
+    # to analyze are sent to the workers
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(engine,)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            plan = _plan(chunk, dedup, near_duplicates)
+            pending.append((plan, executor.submit(_analyze_unique, plan[4], engine)))
+            while len(pending) >= workers * 2 or (pending and pending[0][1].done()):
+                plan, future = pending.popleft()
+                yield _assemble(plan, *future.result())
+        while pending:
+            plan, future = pending.popleft()
+            yield _assemble(plan, *future.result())
+
+def get_sentiment_explanation(text, sentiment, polarity):
+    middle, tail = EXPLANATION_TEMPLATES.get(sentiment, EXPLANATION_TEMPLATES['Neutral'])
+    return f"The text '{text}{middle}{polarity:.2f}{tail}"
 
+def get_sentiment_explanations(texts, sentiments, polarities):
+    """Explanations for aligned sequences of texts, sentiments and polarities.
 
+    Same output as calling get_sentiment_explanation per row, for exports
+    that need the whole column. Each distinct polarity is formatted once
+    (scores repeat heavily, e.g. every neutral text scores 0) and each
+    sentiment's template is looked up once.
+    """
+    distinct, inverse = np.unique(np.asarray(polarities), return_inverse=True)
+    scores = np.array([f"{score:.2f}" for score in distinct.tolist()], dtype=object)[inverse.reshape(-1)]
+    labels = pd.Categorical(np.asarray(sentiments, dtype=object))
+    templates = [EXPLANATION_TEMPLATES.get(label, EXPLANATION_TEMPLATES['Neutral']) for label in labels.categories]
+    templates.append(EXPLANATION_TEMPLATES['Neutral'])
+    return [
+        f"The text '{text}{middle}{score}{tail}"
+        for text, (middle, tail), score in zip(texts, map(templates.__getitem__, labels.codes), scores.tolist())
+    ]
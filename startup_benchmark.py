@@ -0,0 +1,61 @@
+"""Cold-start import benchmark for the project's entry points.
+
+Each entry point is imported in a fresh interpreter several times; the
+median wall time is reported together with the heavy optional
+dependencies that the import pulled in (which should be none of them for
+entry points that do not need them).
+
+Example:
+    python startup_benchmark.py --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ENTRY_POINTS = ('sentiment_analyzer', 'export_utils', 'visualizations', 'results_store', 'jobs', 'cli', 'app')
+
+HEAVY_MODULES = ('nltk', 'textblob', 'sklearn', 'matplotlib', 'wordcloud', 'plotly', 'reportlab', 'streamlit')
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{'seconds': elapsed, 'loaded': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def measure(module, repeat=3):
+    """Return (median seconds, heavy modules loaded) for importing module in fresh interpreters"""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    timings = []
+    loaded = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=directory, capture_output=True, text=True, check=True
+        )
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        timings.append(result['seconds'])
+        loaded = result['loaded']
+    return statistics.median(timings), loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold import time of each entry point.")
+    parser.add_argument('modules', nargs='*', default=list(ENTRY_POINTS), help="Modules to import (default: all entry points)")
+    parser.add_argument('-r', '--repeat', type=int, default=3, help="Fresh interpreters per module (default: 3)")
+    args = parser.parse_args(argv)
+
+    print(f"{'entry point':<20} {'import (s)':>10}  heavy modules loaded")
+    for module in args.modules:
+        seconds, loaded = measure(module, args.repeat)
+        print(f"{module:<20} {seconds:>10.3f}  {', '.join(loaded) or '-'}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,53 @@
+def create_sentiment_metrics_summary(df):
+    """Create summary metrics for sentiment analysis"""
+    if df.empty:
+        return {}
+    
+    total_texts = len(df)
+    
+    # Sentiment counts
+    sentiment_counts = df['sentiment'].value_counts()
+    positive_count = sentiment_counts.get('Positive', 0)
+    negative_count = sentiment_counts.get('Negative', 0)
+    neutral_count = sentiment_counts.get('Neutral', 0)
+    
+    # Percentages
+    positive_pct = (positive_count / total_texts) * 100 if total_texts > 0 else 0
+    negative_pct = (negative_count / total_texts) * 100 if total_texts > 0 else 0
+    neutral_pct = (neutral_count / total_texts) * 100 if total_texts > 0 else 0
+    
+    # Average confidence and polarity
+    avg_confidence = df['confidence'].mean() if 'confidence' in df.columns else 0
+    avg_polarity = df['polarity'].mean() if 'polarity' in df.columns else 0
+    avg_subjectivity = df['subjectivity'].mean() if 'subjectivity' in df.columns else 0
+    
+    return {
+        'total_texts': total_texts,
+        'positive_count': positive_count,
+        'negative_count': negative_count,
+        'neutral_count': neutral_count,
+        'positive_pct': positive_pct,
+        'negative_pct': negative_pct,
+        'neutral_pct': neutral_pct,
+        'avg_confidence': avg_confidence,
+        'avg_polarity': avg_polarity,
+        'avg_subjectivity': avg_subjectivity
+    }
+
+def combine_sentiment_metrics(partials):
+    """Combine summaries of disjoint parts of the data into the summary of all of it"""
+    partials = [metrics for metrics in partials if metrics]
+    total_texts = sum(metrics['total_texts'] for metrics in partials)
+    if not total_texts:
+        return {}
+    
+    combined = {'total_texts': total_texts}
+    for label in ('positive', 'negative', 'neutral'):
+        count = sum(metrics[f'{label}_count'] for metrics in partials)
+        combined[f'{label}_count'] = count
+        combined[f'{label}_pct'] = (count / total_texts) * 100
+    
+    # Averages weighted by the number of texts in each part
+    for name in ('avg_confidence', 'avg_polarity', 'avg_subjectivity'):
+        combined[name] = sum(metrics[name] * metrics['total_texts'] for metrics in partials) / total_texts
+    return combined
@@ -0,0 +1,166 @@
+"""Parity of the vectorized fast paths with the reference implementations they replace"""
+import csv
+import os
+import unittest
+
+from textblob import TextBlob
+
+from lexicon_engine import SCORE_TOLERANCE, LexiconSentimentEngine
+from sentiment_analyzer import _extract_keywords, extract_keywords_corpus
+
+SAMPLE_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sample_data.csv')
+
+NEGATIONS = [
+    "This is not good.",
+    "Not bad at all, honestly.",
+    "I do not like it and I never will.",
+    "It wasn't terrible, it was not great either.",
+    "never happy, not sad",
+]
+
+INTENSIFIERS = [
+    "very good",
+    "The food was extremely bad.",
+    "really very nice people",
+    "very",
+    "It is very not good",
+    "quite incredibly boring movie",
+]
+
+EXCLAMATIONS = [
+    "good!",
+    "Great!!! Awful!!",
+    "bad !",
+    "!",
+    "! good",
+    "Happy, happy, happy!!!!!!",
+]
+
+EMOTICONS = [
+    "great :)",
+    ":( terrible",
+    "new phone :-D",
+    "<3 <3",
+    "meh :/ but fine ;)",
+]
+
+IRONY = [
+    "Yeah, great service (!)",
+    "(!) lovely",
+    "Wonderful (!) (!)",
+]
+
+NO_LEXICON_WORDS = [
+    "",
+    "the of and",
+    "12345",
+    "xyz qwerty",
+    "   ",
+]
+
+KEYWORD_TIES = [
+    "banana apple cherry apple banana cherry",
+    # Same words, first seen in a different order than earlier in the batch
+    "cherry banana apple",
+    "delivery service delivery quality service quality price",
+    "zebra yak xylophone walrus vulture umbrella tiger",
+    "Great great GREAT product, product quality!",
+    "one",
+    "",
+    "the and of is",
+    "42 100 3.14",
+]
+
+
+def _sample_texts():
+    with open(SAMPLE_DATA, newline='', encoding='utf-8') as handle:
+        return [row['text'] for row in csv.DictReader(handle)]
+
+
+class LexiconEngineParityTest(unittest.TestCase):
+    """LexiconSentimentEngine.score agrees with TextBlob(text).sentiment within SCORE_TOLERANCE"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = LexiconSentimentEngine()
+
+    def assert_matches_textblob(self, texts):
+        polarity, subjectivity = self.engine.score(texts)
+        self.assertEqual(len(polarity), len(texts))
+        self.assertEqual(len(subjectivity), len(texts))
+        for text, p, s in zip(texts, polarity, subjectivity):
+            expected = TextBlob(text).sentiment
+            with self.subTest(text=text):
+                self.assertLessEqual(abs(p - expected.polarity), SCORE_TOLERANCE)
+                self.assertLessEqual(abs(s - expected.subjectivity), SCORE_TOLERANCE)
+
+    def test_sample_data(self):
+        self.assert_matches_textblob(_sample_texts())
+
+    def test_negations(self):
+        self.assert_matches_textblob(NEGATIONS)
+
+    def test_intensifiers(self):
+        self.assert_matches_textblob(INTENSIFIERS)
+
+    def test_exclamations(self):
+        self.assert_matches_textblob(EXCLAMATIONS)
+
+    def test_emoticons(self):
+        self.assert_matches_textblob(EMOTICONS)
+
+    def test_irony_mark(self):
+        self.assert_matches_textblob(IRONY)
+
+    def test_batch_without_lexicon_words(self):
+        self.assert_matches_textblob(NO_LEXICON_WORDS)
+        polarity, subjectivity = self.engine.score(NO_LEXICON_WORDS)
+        self.assertEqual(polarity.tolist(), [0.0] * len(NO_LEXICON_WORDS))
+        self.assertEqual(subjectivity.tolist(), [0.0] * len(NO_LEXICON_WORDS))
+
+    def test_empty_batch(self):
+        polarity, subjectivity = self.engine.score([])
+        self.assertEqual(len(polarity), 0)
+        self.assertEqual(len(subjectivity), 0)
+
+    def test_mixed_batch_matches_single_texts(self):
+        # Assessments must not leak across text boundaries within a batch
+        texts = NEGATIONS + NO_LEXICON_WORDS + INTENSIFIERS + EXCLAMATIONS + EMOTICONS + IRONY
+        self.assert_matches_textblob(texts)
+        polarity, subjectivity = self.engine.score(texts)
+        for n, text in enumerate(texts):
+            single_polarity, single_subjectivity = self.engine.score([text])
+            with self.subTest(text=text):
+                self.assertEqual(polarity[n], single_polarity[0])
+                self.assertEqual(subjectivity[n], single_subjectivity[0])
+
+
+class KeywordCorpusParityTest(unittest.TestCase):
+    """extract_keywords_corpus in count mode matches the per-text keyword extractor"""
+
+    def assert_matches_extract_keywords(self, texts):
+        for num_keywords in (1, 2, 3, 5, 10):
+            expected = [_extract_keywords(text, num_keywords) for text in texts]
+            with self.subTest(num_keywords=num_keywords):
+                self.assertEqual(extract_keywords_corpus(texts, num_keywords), expected)
+
+    def test_sample_data(self):
+        self.assert_matches_extract_keywords(_sample_texts())
+
+    def test_ties(self):
+        # Equal counts keep the order in which the words first appear
+        self.assert_matches_extract_keywords(KEYWORD_TIES)
+
+    def test_single_texts(self):
+        for text in KEYWORD_TIES:
+            with self.subTest(text=text):
+                self.assertEqual(extract_keywords_corpus([text]), [_extract_keywords(text)])
+
+    def test_batch_without_keywords(self):
+        texts = ["", "the and of is", "42 100 3.14"]
+        self.assertEqual(extract_keywords_corpus(texts), [[], [], []])
+        self.assertEqual(extract_keywords_corpus([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,87 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-from collections import Counter
+from collections import OrderedDict
 import io
+import sys
 from datetime import datetime, timedelta
 import numpy as np
+from summary_metrics import create_sentiment_metrics_summary
+from compact_results import keyword_frequencies
+from lazy_imports import lazy_module, is_loaded
+
+# Loaded on first use: plotly by the charts, matplotlib and wordcloud only
+# by the word cloud
+px = lazy_module('plotly.express')
+go = lazy_module('plotly.graph_objects')
+plt = lazy_module('matplotlib.pyplot')
+wordcloud = lazy_module('wordcloud')
+
+# Approximate budget for cached figures per dashboard session
+DEFAULT_FIGURE_CACHE_BYTES = 256 * 1024 * 1024
+
+def _is_pyplot_figure(value):
+    # Without matplotlib loaded nothing can be one of its figures
+    return is_loaded('matplotlib.pyplot') and isinstance(value, plt.Figure)
+
+def _estimate_figure_size(value):
+    """Rough memory footprint of a cached chart, metrics dict or other value"""
+    if is_loaded('plotly.graph_objects') and isinstance(value, go.Figure):
+        size = 4096
+        for trace in value.data:
+            for attribute in ('x', 'y', 'values', 'labels', 'text', 'customdata', 'hovertext'):
+                data = getattr(trace, attribute, None)
+                if data is not None and not isinstance(data, str):
+                    size += 16 * len(data)
+        return size
+    if _is_pyplot_figure(value):
+        width, height = value.get_size_inches() * value.dpi
+        # Figure canvas plus the embedded word cloud image
+        return int(width * height * 4) * 2
+    return sys.getsizeof(value)
+
+class FigureCache:
+    """LRU cache of rendered charts keyed by (data version, filter state, chart parameters)"""
+    
+    def __init__(self, max_bytes=DEFAULT_FIGURE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def get_or_create(self, key, factory):
+        """Return the cached value for key, calling factory() to build it on a miss"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+        
+        self.misses += 1
+        value = factory()
+        size = _estimate_figure_size(value)
+        self._entries[key] = (value, size)
+        self._bytes += size
+        # Always keep the newest entry, even when it alone exceeds the budget
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, (old_value, old_size) = self._entries.popitem(last=False)
+            self._bytes -= old_size
+            self._release(old_value)
+        return value
+    
+    def clear(self):
+        for value, _ in self._entries.values():
+            self._release(value)
+        self._entries.clear()
+        self._bytes = 0
+    
+    @staticmethod
+    def _release(value):
+        # pyplot keeps every open figure alive until it is closed
+        if _is_pyplot_figure(value):
+            plt.close(value)
 
 def create_sentiment_distribution_chart(df):
     """Create a pie chart showing sentiment distribution"""
@@ -16,6 +89,8 @@ def create_sentiment_distribution_chart(df):
         return None
     
     sentiment_counts = df['sentiment'].value_counts()
+    # Categorical columns also count sentiments that never occur
+    sentiment_counts = sentiment_counts[sentiment_counts > 0]
     
     # Define colors for sentiments
     colors = {
@@ -60,7 +135,7 @@ def create_sentiment_over_time_chart(df):
         df_copy['date'] = range(len(df_copy))
     
     # Group by date and sentiment
-    sentiment_over_time = df_copy.groupby(['date', 'sentiment']).size().reset_index(name='count')
+    sentiment_over_time = df_copy.groupby(['date', 'sentiment'], observed=True).size().reset_index(name='count')
     
     # Create line chart
     fig = px.line(
@@ -91,7 +166,7 @@ def create_sentiment_by_source_chart(df):
         return None
     
     # Group by source and sentiment
-    source_sentiment = df.groupby(['source', 'sentiment']).size().reset_index(name='count')
+    source_sentiment = df.groupby(['source', 'sentiment'], observed=True).size().reset_index(name='count')
     
     fig = px.bar(
         source_sentiment,
@@ -185,28 +260,13 @@ def create_wordcloud(df, sentiment_filter=None):
     else:
         df_filtered = df
     
-    # Collect all keywords
-    all_keywords = []
-    for keywords_list in df_filtered['keywords']:
-        if isinstance(keywords_list, list):
-            all_keywords.extend(keywords_list)
-        elif isinstance(keywords_list, str):
-            # Handle case where keywords might be stored as string
-            try:
-                import ast
-                keywords_list = ast.literal_eval(keywords_list)
-                all_keywords.extend(keywords_list)
-            except:
-                all_keywords.extend(keywords_list.split(','))
-    
-    if not all_keywords:
-        return None
-    
     # Count keyword frequencies
-    keyword_freq = Counter(all_keywords)
+    keyword_freq = dict(keyword_frequencies(df_filtered))
+    if not keyword_freq:
+        return None
     
     # Create word cloud
-    wordcloud = WordCloud(
+    cloud = wordcloud.WordCloud(
         width=800,
         height=400,
         background_color='white',
@@ -216,7 +276,7 @@ def create_wordcloud(df, sentiment_filter=None):
     
     # Create matplotlib figure
     fig, ax = plt.subplots(figsize=(10, 5))
-    ax.imshow(wordcloud, interpolation='bilinear')
+    ax.imshow(cloud, interpolation='bilinear')
     ax.axis('off')
     ax.set_title('Most Common Keywords', fontsize=16, fontweight='bold')
     
@@ -227,25 +287,8 @@ def create_keyword_frequency_chart(df, top_n=10):
     if df.empty or 'keywords' not in df.columns:
         return None
     
-    # Collect all keywords
-    all_keywords = []
-    for keywords_list in df['keywords']:
-        if isinstance(keywords_list, list):
-            all_keywords.extend(keywords_list)
-        elif isinstance(keywords_list, str):
-            try:
-                import ast
-                keywords_list = ast.literal_eval(keywords_list)
-                all_keywords.extend(keywords_list)
-            except:
-                all_keywords.extend(keywords_list.split(','))
-    
-    if not all_keywords:
-        return None
-    
     # Count keyword frequencies
-    keyword_freq = Counter(all_keywords)
-    top_keywords = keyword_freq.most_common(top_n)
+    top_keywords = keyword_frequencies(df)[:top_n]
     
     if not top_keywords:
         return None
@@ -267,42 +310,6 @@ def create_keyword_frequency_chart(df, top_n=10):
     
     return fig
 
-def create_sentiment_metrics_summary(df):
-    """Create summary metrics for sentiment analysis"""
-    if df.empty:
-        return {}
-    
-    total_texts = len(df)
-    
-    # Sentiment counts
-    sentiment_counts = df['sentiment'].value_counts()
-    positive_count = sentiment_counts.get('Positive', 0)
-    negative_count = sentiment_counts.get('Negative', 0)
-    neutral_count = sentiment_counts.get('Neutral', 0)
-    
-    # Percentages
-    positive_pct = (positive_count / total_texts) * 100 if total_texts > 0 else 0
-    negative_pct = (negative_count / total_texts) * 100 if total_texts > 0 else 0
-    neutral_pct = (neutral_count / total_texts) * 100 if total_texts > 0 else 0
-    
-    # Average confidence and polarity
-    avg_confidence = df['confidence'].mean() if 'confidence' in df.columns else 0
-    avg_polarity = df['polarity'].mean() if 'polarity' in df.columns else 0
-    avg_subjectivity = df['subjectivity'].mean() if 'subjectivity' in df.columns else 0
-    
-    return {
-        'total_texts': total_texts,
-        'positive_count': positive_count,
-        'negative_count': negative_count,
-        'neutral_count': neutral_count,
-        'positive_pct': positive_pct,
-        'negative_pct': negative_pct,
-        'neutral_pct': neutral_pct,
-        'avg_confidence': avg_confidence,
-        'avg_polarity': avg_polarity,
-        'avg_subjectivity': avg_subjectivity
-    }
-
 def display_comparative_analysis(df1, df2, label1="Dataset 1", label2="Dataset 2"):
     """Display comparative analysis between two datasets"""
     if df1.empty or df2.empty: